@@ -14,6 +14,7 @@ import chromadb
 import anthropic  # For strategic decisions
 import threading
 import queue
+from landmark_index import LandmarkIndex
 
 @dataclass
 class AIGoal:
@@ -583,6 +584,7 @@ class ComprehensiveAI:
         self.world_db = WorldDatabase()
         self.goal_manager = GoalManager()
         self.decision_maker = IntelligentDecisionMaker(config)
+        self.landmarks = LandmarkIndex()
 
         # State tracking
         self.current_context = {}
@@ -601,6 +603,12 @@ class ComprehensiveAI:
     async def update_context(self, game_state: Dict):
         """Update AI's understanding of current game state"""
 
+        # Recognize the location from the current view when vision couldn't name it
+        if game_state.get('location', 'unknown') == 'unknown' and game_state.get('view') is not None:
+            match = self.landmarks.lookup(game_state['view'])
+            if match:
+                game_state['location'] = match[0]
+
         self.current_context.update({
             'timestamp': time.time(),
             'location': game_state.get('location', 'unknown'),
@@ -638,6 +646,11 @@ class ComprehensiveAI:
             self.session_stats['locations_discovered'] += 1
             print(f"📍 Learned new location: {location_name}")
 
+        # A named location (OCR banner / map) confirms what this view looks like;
+        # a landmark match alone must not reinforce itself
+        if location_name and game_state.get('view') is not None and game_state.get('location_confirmed'):
+            self.landmarks.add_view(game_state['view'], location_name)
+
     def _classify_location(self, game_state: Dict) -> str:
         """Classify location type based on game state"""
 
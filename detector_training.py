@@ -0,0 +1,256 @@
+# detector_training.py
+# Distilled Fallout-specific nano detector from recorded sessions
+# Records HORIZON frames auto-labeled by the current detectors (YOLO + enemy
+# markers), round-trips the labels through a JSONL review file for manual
+# correction, then fine-tunes a reduced-class, low-resolution YOLO on CPU and
+# compares its recall and speed against the COCO model on our classes.
+
+import os
+import json
+import time
+import random
+from typing import Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from threat_scoring import threat_level_for_label
+
+# Reduced label set: only what the decision tiers actually use
+DETECTOR_CLASSES = ["hostile", "player", "creature", "health_bar"]
+CLASS_IDS = {name: i for i, name in enumerate(DETECTOR_CLASSES)}
+
+def write_yolo_labels(path: str, labels: List[Dict], size):
+    """Pixel xyxy boxes -> one 'class cx cy w h' (normalized) line per box"""
+    width, height = size
+    lines = []
+    for label in labels:
+        x1, y1, x2, y2 = label['box']
+        lines.append(f"{CLASS_IDS[label['class']]} {(x1 + x2) / 2 / width:.6f} {(y1 + y2) / 2 / height:.6f} "
+                     f"{(x2 - x1) / width:.6f} {(y2 - y1) / height:.6f}")
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+
+def auto_label(detections: List[Dict], hostiles: Optional[Dict] = None) -> List[Dict]:
+    """Map COCO detections and enemy markers onto DETECTOR_CLASSES boxes"""
+    bars = [hostile['box'] for hostile in (hostiles or {}).get('hostiles', [])]
+    labels = [{'class': 'health_bar', 'box': list(bar)} for bar in bars]
+
+    for det in detections:
+        level = threat_level_for_label(det['label'])
+        if level == 0 or 'box' not in det:
+            continue  # Scenery, objects and passive animals aren't worth a class
+        x1, y1, x2, y2 = det['box']
+        height = y2 - y1
+        # A health bar floating just above the box means the game considers it hostile
+        marked = any(x1 <= (bx1 + bx2) / 2 <= x2 and y1 - height * 0.5 <= by2 <= y1 + height * 0.25
+                     for bx1, by1, bx2, by2 in bars)
+        if marked:
+            name = 'hostile'
+        else:
+            name = 'player' if level == 4 else 'creature'
+        labels.append({'class': name, 'box': [x1, y1, x2, y2]})
+    return labels
+
+class SessionRecorder:
+    """Saves sampled gameplay frames with YOLO-format auto-labels"""
+
+    def __init__(self, root: str = "datasets/fo76", min_interval: float = 2.0, enabled: bool = False):
+        self.root = root
+        self.min_interval = min_interval  # s between saved frames; consecutive frames are near-duplicates
+        self.enabled = enabled
+        self.last_saved = 0.0
+        self.stats = {'frames_saved': 0, 'boxes_saved': 0}
+
+    def record(self, img, detections: List[Dict], hostiles: Optional[Dict] = None, complete: bool = True) -> Optional[str]:
+        """Save one frame + labels; returns the frame id, or None if skipped
+
+        Only pass complete=True when the detector saw the whole frame (not
+        saliency crops), otherwise unlabeled objects become false negatives.
+        """
+        now = time.time()
+        if not self.enabled or not complete or now - self.last_saved < self.min_interval:
+            return None
+        self.last_saved = now
+
+        for sub in ("images", "labels"):
+            os.makedirs(os.path.join(self.root, sub), exist_ok=True)
+
+        frame_id = f"{int(now * 1000)}"
+        labels = auto_label(detections, hostiles)
+        img.save(os.path.join(self.root, "images", f"{frame_id}.jpg"), quality=90)
+        write_yolo_labels(os.path.join(self.root, "labels", f"{frame_id}.txt"), labels, img.size)
+        self.stats['frames_saved'] += 1
+        self.stats['boxes_saved'] += len(labels)
+        return frame_id
+
+class DatasetBuilder:
+    """Review round-trip, train/val split and dataset.yaml for a recorded dataset"""
+
+    def __init__(self, root: str = "datasets/fo76"):
+        self.root = root
+
+    def frame_ids(self) -> List[str]:
+        return sorted(name[:-4] for name in os.listdir(os.path.join(self.root, "images")) if name.endswith(".jpg"))
+
+    def read_labels(self, frame_id: str, size) -> List[Dict]:
+        width, height = size
+        path = os.path.join(self.root, "labels", f"{frame_id}.txt")
+        labels = []
+        if os.path.exists(path):
+            for line in open(path).read().splitlines():
+                class_id, cx, cy, w, h = line.split()
+                cx, cy, w, h = float(cx) * width, float(cy) * height, float(w) * width, float(h) * height
+                labels.append({'class': DETECTOR_CLASSES[int(class_id)],
+                               'box': [round(cx - w / 2), round(cy - h / 2), round(cx + w / 2), round(cy + h / 2)]})
+        return labels
+
+    def export_review(self, path: str = None) -> str:
+        """One JSON line per frame with pixel boxes; edit 'boxes' and set 'reviewed': true"""
+        path = path or os.path.join(self.root, "review.jsonl")
+        with open(path, "w") as f:
+            for frame_id in self.frame_ids():
+                size = Image.open(os.path.join(self.root, "images", f"{frame_id}.jpg")).size
+                f.write(json.dumps({'frame': frame_id, 'size': list(size),
+                                    'boxes': self.read_labels(frame_id, size), 'reviewed': False}) + "\n")
+        print(f"📝 Exported {len(self.frame_ids())} frames for review: {path}")
+        return path
+
+    def import_review(self, path: str = None, drop_unreviewed: bool = False) -> Dict:
+        """Write corrected boxes back to the YOLO label files"""
+        path = path or os.path.join(self.root, "review.jsonl")
+        result = {'updated': 0, 'dropped': 0}
+        for line in open(path):
+            entry = json.loads(line)
+            if not entry.get('reviewed'):
+                if drop_unreviewed:
+                    for sub, ext in (("images", "jpg"), ("labels", "txt")):
+                        target = os.path.join(self.root, sub, f"{entry['frame']}.{ext}")
+                        if os.path.exists(target):
+                            os.remove(target)
+                    result['dropped'] += 1
+                continue
+            write_yolo_labels(os.path.join(self.root, "labels", f"{entry['frame']}.txt"), entry['boxes'], entry['size'])
+            result['updated'] += 1
+        print(f"📝 Imported review: {result}")
+        return result
+
+    def write_yaml(self, val_fraction: float = 0.2, seed: int = 76) -> str:
+        frame_ids = self.frame_ids()
+        random.Random(seed).shuffle(frame_ids)
+        split = max(1, int(len(frame_ids) * val_fraction))
+        images = os.path.abspath(os.path.join(self.root, "images"))
+        for name, ids in (("val", frame_ids[:split]), ("train", frame_ids[split:])):
+            with open(os.path.join(self.root, f"{name}.txt"), "w") as f:
+                f.write("\n".join(os.path.join(images, f"{frame_id}.jpg") for frame_id in ids))
+
+        path = os.path.join(self.root, "dataset.yaml")
+        with open(path, "w") as f:
+            f.write(f"path: {os.path.abspath(self.root)}\ntrain: train.txt\nval: val.txt\n")
+            f.write("names:\n" + "".join(f"  {i}: {name}\n" for i, name in enumerate(DETECTOR_CLASSES)))
+        return path
+
+def train_nano(dataset_yaml: str, base_model: str = "yolov8n.pt", imgsz: int = 320, epochs: int = 50,
+               export_format: str = "onnx") -> str:
+    """Fine-tune a reduced-class detector on CPU and export it; returns the exported path"""
+    from ultralytics import YOLO
+
+    model = YOLO(base_model)
+    model.train(data=dataset_yaml, imgsz=imgsz, epochs=epochs, device="cpu", batch=16, workers=2,
+                project="runs/fo76", name="nano", exist_ok=True)
+    exported = YOLO(str(model.trainer.best)).export(format=export_format, imgsz=imgsz)
+    print(f"🧠 Trained detector exported to {exported}")
+    return exported
+
+def _iou(a, b) -> float:
+    ix = max(0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+def evaluate_recall(model_path: str, root: str = "datasets/fo76", imgsz: Optional[int] = None,
+                    coco_model: bool = False, iou_threshold: float = 0.5) -> Dict:
+    """Per-class recall and mean inference time on the val split
+
+    coco_model=True maps a COCO detector's labels through auto_label's
+    player/creature rules so the baseline is scored on our classes.
+    health_bar/hostile boxes come from markers, so a COCO model is only
+    scored on player+creature (hostile ground truth counts as creature).
+    """
+    from ultralytics import YOLO
+
+    model = YOLO(model_path)
+    builder = DatasetBuilder(root)
+    val_ids = [os.path.basename(line)[:-4] for line in open(os.path.join(root, "val.txt")).read().splitlines()]
+
+    found = {name: 0 for name in DETECTOR_CLASSES}
+    total = {name: 0 for name in DETECTOR_CLASSES}
+    timings = []
+    for frame_id in val_ids:
+        img = Image.open(os.path.join(root, "images", f"{frame_id}.jpg"))
+        truth = builder.read_labels(frame_id, img.size)
+
+        start = time.perf_counter()
+        result = model(img, imgsz=imgsz, verbose=False)[0] if imgsz else model(img, verbose=False)[0]
+        timings.append((time.perf_counter() - start) * 1000)
+
+        predicted = []
+        for box in result.boxes:
+            label = model.names[int(box.cls[0])]
+            xyxy = [float(v) for v in box.xyxy[0].cpu().numpy()]
+            if coco_model:
+                level = threat_level_for_label(label)
+                if level == 0:
+                    continue
+                label = 'player' if level == 4 else 'creature'
+            predicted.append((label, xyxy))
+
+        for gt in truth:
+            name = gt['class']
+            if coco_model:
+                if name == 'health_bar':
+                    continue
+                name = 'creature' if name == 'hostile' else name
+            total[name] += 1
+            if any(label == name and _iou(xyxy, gt['box']) >= iou_threshold for label, xyxy in predicted):
+                found[name] += 1
+
+    recall = {name: round(found[name] / total[name], 3) for name in DETECTOR_CLASSES if total[name]}
+    return {'model': model_path, 'recall': recall, 'mean_recall': round(float(np.mean(list(recall.values()))), 3) if recall else 0.0,
+            'inference_ms': round(float(np.mean(timings)), 2) if timings else 0.0, 'frames': len(val_ids)}
+
+def compare_to_baseline(candidate: str, baseline: str = "yolov8n.pt", root: str = "datasets/fo76", imgsz: int = 320) -> Dict:
+    """Candidate vs COCO baseline on the val split; 'better' means equal+ recall in less time"""
+    new = evaluate_recall(candidate, root, imgsz=imgsz)
+    old = evaluate_recall(baseline, root, coco_model=True)
+    shared = [name for name in old['recall'] if name in new['recall']]
+    recall_ok = all(new['recall'][name] >= old['recall'][name] for name in shared)
+    report = {'candidate': new, 'baseline': old,
+              'speedup': round(old['inference_ms'] / new['inference_ms'], 2) if new['inference_ms'] else None,
+              'better': recall_ok and new['inference_ms'] < old['inference_ms']}
+    print(f"🧠 Candidate recall {new['recall']} in {new['inference_ms']}ms vs baseline {old['recall']} in {old['inference_ms']}ms")
+    return report
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build, review and train the Fallout-specific detector")
+    parser.add_argument("step", choices=["export", "import", "train", "compare"])
+    parser.add_argument("--root", default="datasets/fo76")
+    parser.add_argument("--review", default=None, help="review JSONL path (export/import)")
+    parser.add_argument("--imgsz", type=int, default=320)
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--model", default=None, help="candidate model to compare")
+    args = parser.parse_args()
+
+    builder = DatasetBuilder(args.root)
+    if args.step == "export":
+        builder.export_review(args.review)
+    elif args.step == "import":
+        builder.import_review(args.review)
+    elif args.step == "train":
+        exported = train_nano(builder.write_yaml(), imgsz=args.imgsz, epochs=args.epochs)
+        print(json.dumps(compare_to_baseline(exported, root=args.root, imgsz=args.imgsz), indent=2))
+    elif args.step == "compare":
+        print(json.dumps(compare_to_baseline(args.model, root=args.root, imgsz=args.imgsz), indent=2))
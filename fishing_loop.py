@@ -0,0 +1,131 @@
+# fishing_loop.py
+# Dedicated high-frequency bite reaction loop (knowledge/08_fishing.txt, Section 2.2)
+# Samples only the BOBBER ROI at 60 Hz with raw pixel statistics and reels in
+# within a few milliseconds of the compound bite trigger. The main loop awaits
+# this off-thread, so YOLO and the LLM are idle while a line is in the water.
+
+import time
+from typing import Dict
+
+import numpy as np
+import mss
+
+from input_macros import MacroLibrary
+
+class BobberStats:
+    """Per-frame bobber visibility and splash foam from a subsampled BGRA grab"""
+
+    SUBSAMPLE = 4
+
+    @classmethod
+    def measure(cls, bgra: np.ndarray) -> Dict[str, float]:
+        small = bgra[::cls.SUBSAMPLE, ::cls.SUBSAMPLE]
+        b = small[..., 0].astype(np.int16)
+        g = small[..., 1].astype(np.int16)
+        r = small[..., 2].astype(np.int16)
+
+        # The bobber is the only saturated red thing on the water
+        bobber = np.count_nonzero((r > 150) & (r - g > 70) & (r - b > 70)) / r.size
+        # Splash: white foam, compared against the calm-water baseline
+        white = np.count_nonzero((r > 215) & (g > 215) & (b > 215)) / r.size
+        return {'bobber': bobber, 'white': white}
+
+class FishingLoop:
+    """Cast, watch the bobber at 60 Hz, ignore nibbles and reel on the real bite"""
+
+    BASELINE_FRAMES = 30
+    SUBMERGED_RATIO = 0.25      # bobber visibility vs baseline that counts as "pulled under"
+    NIBBLE_RATIO = 0.7          # a dip to here (but not below SUBMERGED_RATIO) is a nibble
+    SPLASH_WHITE = 0.02         # white fraction above baseline that counts as a large splash
+    COMPOUND_WINDOW = 0.15      # s: submersion and splash must coincide within this
+
+    def __init__(self, vision, controller, rate_hz: float = 60.0, macros: MacroLibrary = None):
+        self.vision = vision
+        self.controller = controller
+        self.macros = macros or MacroLibrary()
+        self.rate_hz = rate_hz
+        self.active = False
+        self.stats = {
+            'casts': 0, 'bites': 0, 'nibbles_ignored': 0, 'timeouts': 0,
+            'last_reaction_ms': 0.0, 'sample_hz': 0.0
+        }
+
+    def run(self, timeout: float = 60.0, cast: bool = True) -> Dict:
+        """Blocking cast-and-wait; returns 'hooked', 'timeout' or 'no_bobber'. Run via asyncio.to_thread."""
+        roi = self.vision.scaled_rois.get("BOBBER")
+        if roi is None:
+            return {'result': 'no_bobber'}
+
+        self.active = True
+        try:
+            # Nothing else should be grabbing frames meanwhile
+            with self.vision.scheduler.paused(), mss.mss() as sct:
+                return self._watch(sct, roi, timeout, cast)
+        finally:
+            self.active = False
+
+    def _watch(self, sct, roi, timeout: float, cast: bool) -> Dict:
+        if cast:
+            # Sub-protocol 2.2.1: cast, then wait out the bobber's bounce (timed by the input scheduler)
+            self.macros.play(self.controller, "CAST_LINE").wait()
+            self.stats['casts'] += 1
+
+        period = 1.0 / self.rate_hz
+        baseline_bobber = []
+        baseline_white = []
+        submerged_at = None
+        splash_at = None
+        nibbling = False
+        frames = 0
+
+        start = time.perf_counter()
+        next_frame = start
+        while time.perf_counter() - start < timeout:
+            frame_time = time.perf_counter()
+            self.controller.heartbeat()  # This loop is the one deciding while the line is out
+            grab = sct.grab(roi)
+            sample = BobberStats.measure(np.frombuffer(grab.bgra, dtype=np.uint8).reshape(grab.height, grab.width, 4))
+            frames += 1
+
+            if len(baseline_bobber) < self.BASELINE_FRAMES:
+                baseline_bobber.append(sample['bobber'])
+                baseline_white.append(sample['white'])
+                if len(baseline_bobber) == self.BASELINE_FRAMES and np.median(baseline_bobber) <= 0:
+                    return self._finish('no_bobber', frames, start)
+            else:
+                visible = sample['bobber'] / max(np.median(baseline_bobber), 1e-6)
+                splash = sample['white'] - np.median(baseline_white) > self.SPLASH_WHITE
+
+                # Last time each cue was seen; the two rarely land on the exact same frame
+                if visible < self.SUBMERGED_RATIO:
+                    submerged_at = frame_time
+                if splash:
+                    splash_at = frame_time
+
+                # Rule 2.2.2.2: submersion AND a large splash together is the bite
+                if submerged_at and splash_at and abs(submerged_at - splash_at) <= self.COMPOUND_WINDOW:
+                    self.macros.play(self.controller, "REEL_IN")
+                    self.stats['last_reaction_ms'] = (time.perf_counter() - frame_time) * 1000
+                    self.stats['bites'] += 1
+                    print(f"🎣 Bite! Reeled in {self.stats['last_reaction_ms']:.1f}ms after the frame")
+                    return self._finish('hooked', frames, start)
+
+                # Rule 2.2.2.1: a partial dip or bounce is a nibble - keep waiting
+                if visible < self.NIBBLE_RATIO and not nibbling:
+                    self.stats['nibbles_ignored'] += 1
+                nibbling = visible < self.NIBBLE_RATIO
+
+            next_frame += period
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_frame = time.perf_counter()  # Fell behind; don't burst to catch up
+
+        self.stats['timeouts'] += 1
+        return self._finish('timeout', frames, start)
+
+    def _finish(self, result: str, frames: int, start: float) -> Dict:
+        elapsed = time.perf_counter() - start
+        self.stats['sample_hz'] = round(frames / elapsed, 1) if elapsed > 0 else 0.0
+        return {'result': result, 'frames': frames, 'seconds': round(elapsed, 2)}
@@ -0,0 +1,266 @@
+# gamepad_emulator.py
+# Virtual Xbox-style gamepad backend for ActionController (Steam Deck native input)
+# Same action names as ACTION_TO_KEY. Movement drives the left stick and look
+# drives the right stick as continuous analog setpoints, written only when
+# they change, instead of streams of key toggles and relative mouse steps.
+
+import time
+from typing import Tuple
+
+from evdev import UInput, AbsInfo, ecodes as e
+
+from input_emulator import ActionController, ActionHandle, sleep_until
+
+# Xbox layout, Fallout 76 default controller bindings
+GAMEPAD_BUTTONS = {
+    "JUMP": e.BTN_SOUTH,        # A
+    "ENTER": e.BTN_SOUTH,
+    "INTERACT": e.BTN_WEST,     # X (tap: interact, hold: reload)
+    "RELOAD": e.BTN_WEST,
+    "TAB": e.BTN_EAST,          # B: Pip-Boy
+    "I": e.BTN_NORTH,           # Y
+    "VATS": e.BTN_TL,           # LB
+    "F": e.BTN_TR,              # RB
+    "SPRINT": e.BTN_THUMBL,     # L3
+    "C": e.BTN_THUMBR,          # R3
+    "M": e.BTN_SELECT,          # View: map
+    "ESC": e.BTN_START,         # Menu
+}
+GAMEPAD_TRIGGERS = {"ATTACK": e.ABS_RZ, "AIM": e.ABS_Z}
+GAMEPAD_DPAD = {"UP": (e.ABS_HAT0Y, -1), "DOWN": (e.ABS_HAT0Y, 1)}
+# (strafe, forward) unit vectors
+MOVE_VECTORS = {"FORWARD": (0, 1), "BACKWARD": (0, -1), "STRAFE_LEFT": (-1, 0), "STRAFE_RIGHT": (1, 0)}
+
+STICK_MAX = 32767
+TRIGGER_MAX = 255
+
+class GamepadController(ActionController):
+    """ActionController whose device is a virtual gamepad; press/schedule/macros work unchanged"""
+
+    # Mouse-count equivalent turned per second at full right-stick deflection, so callers
+    # can keep passing dx/dy in the keyboard backend's units. Calibrate against the in-game sensitivity.
+    LOOK_FULL_RATE = 1500.0
+    NUDGE_PERIOD = (1 / 125, 1 / 15)    # bounds on the interval a single look delta is spread over
+
+    def __init__(self, device=None):
+        self.axes = {}                  # ABS code -> last written value
+        self.move_keys = set()
+        self.move_speed = {action_name: 1.0 for action_name in MOVE_VECTORS}   # stick deflection per held move
+        self.move_setpoint = (0.0, 0.0)
+        self.look_owner = None          # handle whose look setpoint is on the stick
+        self._last_nudge = 0.0
+        # Right-stick deflection and since when, integrated into REL-equivalent counts for listeners
+        self._look_xy = (0.0, 0.0)
+        self._look_since = time.perf_counter()
+        self._turn_residual = (0.0, 0.0)
+        self._nudge_seq = 0
+        self._unbound_warned = set()
+        super().__init__(device=device)
+
+    def _open_device(self):
+        stick = AbsInfo(value=0, min=-STICK_MAX - 1, max=STICK_MAX, fuzz=16, flat=128, resolution=0)
+        trigger = AbsInfo(value=0, min=0, max=TRIGGER_MAX, fuzz=0, flat=0, resolution=0)
+        hat = AbsInfo(value=0, min=-1, max=1, fuzz=0, flat=0, resolution=0)
+        capabilities = {
+            e.EV_KEY: sorted(set(GAMEPAD_BUTTONS.values())),
+            e.EV_ABS: [(e.ABS_X, stick), (e.ABS_Y, stick), (e.ABS_RX, stick), (e.ABS_RY, stick),
+                       (e.ABS_Z, trigger), (e.ABS_RZ, trigger), (e.ABS_HAT0X, hat), (e.ABS_HAT0Y, hat)],
+        }
+        # Xbox 360 ids so Steam/Proton pick up the standard layout
+        return UInput(capabilities, name="Microsoft X-Box 360 pad", vendor=0x045E, product=0x028E, version=0x110)
+
+    # --- Device writes (called under _device_lock) ---
+
+    def _set_axis(self, code, value) -> bool:
+        """Write an ABS value only if it differs from what the device already has"""
+        value = int(value)
+        if self.axes.get(code, 0) == value:
+            return False
+        self.device.write(e.EV_ABS, code, value)
+        self.axes[code] = value
+        return True
+
+    def _set_stick(self, code_x, code_y, x, y) -> bool:
+        """x right, y up in [-1, 1]; evdev sticks are positive down"""
+        changed = self._set_axis(code_x, max(-1.0, min(1.0, x)) * STICK_MAX)
+        return self._set_axis(code_y, -max(-1.0, min(1.0, y)) * STICK_MAX) or changed
+
+    def _right_stick(self, x, y):
+        """Set the look stick; returns (changed, listener notices)
+
+        Listeners (PoseEstimator) expect ('look', 'REL_X', counts), so the
+        turn made at the outgoing deflection is integrated and reported in
+        the keyboard backend's units whenever the setpoint changes.
+        """
+        now = time.perf_counter()
+        elapsed = now - self._look_since
+        old_x, old_y = self._look_xy
+        turned_x = old_x * self.LOOK_FULL_RATE * elapsed + self._turn_residual[0]
+        turned_y = -old_y * self.LOOK_FULL_RATE * elapsed + self._turn_residual[1]
+        counts_x, counts_y = int(round(turned_x)), int(round(turned_y))
+        self._turn_residual = (turned_x - counts_x, turned_y - counts_y)
+
+        x, y = max(-1.0, min(1.0, x)), max(-1.0, min(1.0, y))
+        self._look_xy = (x, y)
+        self._look_since = now
+        changed = self._set_stick(e.ABS_RX, e.ABS_RY, x, y)
+
+        notices = []
+        if counts_x:
+            notices.append(("look", "REL_X", counts_x))
+        if counts_y:
+            notices.append(("look", "REL_Y", counts_y))
+        return changed, notices
+
+    def _apply_move(self) -> bool:
+        x, y = self.move_setpoint
+        for action_name in self.move_keys:
+            x += MOVE_VECTORS[action_name][0] * self.move_speed[action_name]
+            y += MOVE_VECTORS[action_name][1] * self.move_speed[action_name]
+        return self._set_stick(e.ABS_X, e.ABS_Y, x, y)
+
+    def _write_key(self, action_name, value):
+        if action_name in MOVE_VECTORS:
+            (self.move_keys.add if value else self.move_keys.discard)(action_name)
+            self._apply_move()
+        elif action_name in GAMEPAD_TRIGGERS:
+            self._set_axis(GAMEPAD_TRIGGERS[action_name], TRIGGER_MAX if value else 0)
+        elif action_name in GAMEPAD_DPAD:
+            code, direction = GAMEPAD_DPAD[action_name]
+            self._set_axis(code, direction if value else 0)
+        elif action_name in GAMEPAD_BUTTONS:
+            self.device.write(e.EV_KEY, GAMEPAD_BUTTONS[action_name], value)
+        elif action_name not in self._unbound_warned:
+            self._unbound_warned.add(action_name)
+            print(f"⚠️ {action_name} has no gamepad binding")
+
+    def _write_look(self, dx, dy):
+        """Relative look delta (e.g. a macro look step) -> right-stick rate over the nudge interval"""
+        now = time.perf_counter()
+        low, high = self.NUDGE_PERIOD
+        period = min(max(now - self._last_nudge, low), high)
+        self._last_nudge = now
+        _, notices = self._right_stick(dx / period / self.LOOK_FULL_RATE, -dy / period / self.LOOK_FULL_RATE)
+
+        # Recentre after exactly the interval (so the turn matches the delta) unless
+        # another delta or a scheduled look has taken over by then
+        self._nudge_seq += 1
+        seq = self._nudge_seq
+        self.scheduler.at(now + period, lambda: self._end_nudge(seq))
+        return notices
+
+    def _end_nudge(self, seq):
+        if seq == self._nudge_seq and self.look_owner is None:
+            self.set_look(0.0, 0.0)
+
+    # --- Analog setpoints ---
+
+    def set_move(self, strafe: float, forward: float):
+        """Analog movement in [-1, 1], combined with any held movement actions"""
+        with self._device_lock:
+            self.move_setpoint = (strafe, forward)
+            if self._apply_move():
+                self.device.syn()
+        self._notify("stick", "LEFT", self.move_setpoint)
+
+    def set_move_speed(self, action_name: str, speed: float):
+        """Left-stick deflection in (0, 1] a movement action holds at (1.0 = run, ~0.5 = walk)
+
+        Applies at once if the action is already held, so a coalesced decision
+        can change pace without a release.
+        """
+        speed = max(0.05, min(1.0, float(speed)))
+        with self._device_lock:
+            self.move_speed[action_name] = speed
+            changed = action_name in self.move_keys and self._apply_move()
+            if changed:
+                self.device.syn()
+        if changed:
+            self._notify("stick", "LEFT", (self.axes.get(e.ABS_X, 0) / STICK_MAX, -self.axes.get(e.ABS_Y, 0) / STICK_MAX))
+
+    def set_look(self, x: float, y: float):
+        """Right stick deflection in [-1, 1] (x right, y up); held until changed"""
+        with self._device_lock:
+            changed, notices = self._right_stick(x, y)
+            if changed:
+                self.device.syn()
+        for event, action, value in notices:
+            self._notify(event, action, value)
+        self._notify("stick", "RIGHT", (x, y))
+
+    def _look_rate(self, dx, dy, duration) -> Tuple[float, float, float]:
+        """Stick deflection that turns (dx, dy) counts over duration; stretches the turn if it would saturate"""
+        duration = max(duration, 1e-3)
+        x = dx / duration / self.LOOK_FULL_RATE
+        y = -dy / duration / self.LOOK_FULL_RATE
+        stretch = max(1.0, abs(x), abs(y))
+        return x / stretch, y / stretch, duration * stretch
+
+    # --- Look overrides ---
+
+    def move_mouse(self, dx, dy):
+        """Closed-loop correction: deflect the right stick for one nudge interval"""
+        with self._device_lock:
+            written = time.perf_counter()
+            notices = self._write_look(int(dx), int(dy))
+            self.device.syn()
+        synced = time.perf_counter()
+        for event, action, value in notices:
+            self._notify(event, action, value)
+        return written, synced
+
+    def schedule_look(self, dx, dy, duration=0.1, delay=0.0, priority=0, easing="ease_in_out"):
+        """Non-blocking look as one constant right-stick setpoint (easing doesn't apply to a rate)"""
+        x, y, duration = self._look_rate(dx, dy, duration)
+        start = time.perf_counter() + delay
+        handle = ActionHandle("SMOOTH_LOOK", start, start + duration, priority, self)
+        handle.state = "active"
+        handle.started_at = start
+        with self._handles_lock:
+            self.in_flight.add(handle)
+
+        def begin():
+            if handle.cancelled:
+                return
+            self.look_owner = handle
+            self.set_look(x, y)
+
+        def finish():
+            with self._handles_lock:
+                if handle.cancelled:
+                    return
+                handle.state = "done"
+                self.in_flight.discard(handle)
+            if self.look_owner is handle:
+                self.look_owner = None
+                self.set_look(0.0, 0.0)
+            self._record_timing("SMOOTH_LOOK", 'duration_error', time.perf_counter() - handle.end)
+            handle.done.set()
+
+        self.scheduler.at(start, begin)
+        self.scheduler.at(handle.end, finish)
+        return handle
+
+    def smooth_look(self, dx, dy, duration=0.1, easing="ease_in_out"):
+        """Blocking analog look"""
+        print(f"👀 Looking (stick): dx={dx}, dy={dy}")
+        x, y, duration = self._look_rate(dx, dy, duration)
+        start = time.perf_counter()
+        self.set_look(x, y)
+        sleep_until(start + duration)
+        self.set_look(0.0, 0.0)
+
+    def cancel(self, handle):
+        cancelled = super().cancel(handle)
+        if cancelled and self.look_owner is handle:
+            self.look_owner = None
+            self.set_look(0.0, 0.0)
+        return cancelled
+
+    def release_all(self):
+        """Also centre both sticks"""
+        held = super().release_all()
+        self.look_owner = None
+        self.set_look(0.0, 0.0)
+        self.set_move(0.0, 0.0)
+        return held
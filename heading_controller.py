@@ -0,0 +1,222 @@
+# heading_controller.py
+# Compass-based closed-loop heading hold while walking
+# Reads the COMPASS strip the capture scheduler already grabs at 30 Hz, gets
+# the current heading from the cardinal letters (or the offset of a quest
+# marker), and nudges REL_X proportionally whenever FORWARD is held. Higher
+# tiers only set a target bearing or "follow the marker" once per leg.
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import cv2
+
+from vats_reader import DigitTemplates
+
+CARDINAL_BEARINGS = {"N": 0.0, "E": 90.0, "S": 180.0, "W": 270.0}
+
+def angle_error(target: float, current: float) -> float:
+    """Signed shortest turn from current to target, in degrees (-180, 180]"""
+    return (target - current + 180.0) % 360.0 - 180.0
+
+class CardinalTemplates(DigitTemplates):
+    """N/E/S/W glyph templates for the compass strip"""
+
+    SYMBOLS = "NESW"
+
+    def __init__(self, template_dir: str = "templates/compass"):
+        super().__init__(template_dir)
+
+class CompassReader:
+    """Heading and marker offsets from one compass strip capture"""
+
+    SPAN_DEG = 180.0            # degrees shown across the strip's full width (calibrate in game)
+    MIN_MATCH = 0.6
+    MARKER_FILL = 0.55          # markers are solid icons; unmatched strokes are ignored
+
+    def __init__(self, hud_range=([20, 100, 100], [40, 255, 255]), span_deg: float = SPAN_DEG):
+        self.hud_lower, self.hud_upper = np.array(hud_range[0]), np.array(hud_range[1])
+        self.span_deg = span_deg
+        self.templates = CardinalTemplates()
+
+    def read(self, img) -> Dict:
+        """{'heading': deg or None, 'markers': [offset deg, + = right], 'read_ms'}"""
+        start = time.perf_counter()
+        rgb = np.asarray(img)
+        mask = cv2.inRange(cv2.cvtColor(rgb, cv2.COLOR_RGB2HSV), self.hud_lower, self.hud_upper)
+        height, width = mask.shape
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+
+        headings = []
+        markers = []
+        for x, y, w, h, area in stats[1:count]:
+            # Tick marks are thin slivers; glyphs and icons are a good fraction of the strip tall
+            if h < 0.25 * height or w < 0.3 * h:
+                continue
+            offset = float(((x + w / 2) - width / 2) / width * self.span_deg)
+            symbol, score = self.templates.classify(mask[y:y + h, x:x + w])
+            if score >= self.MIN_MATCH:
+                # The letter sits `offset` degrees right of where we're facing
+                headings.append((CARDINAL_BEARINGS[symbol] - offset) % 360.0)
+            elif area / float(w * h) >= self.MARKER_FILL:
+                markers.append(offset)
+
+        heading = None
+        if headings:
+            # Circular mean so readings either side of north don't average to south
+            radians = np.radians(headings)
+            heading = float(np.degrees(np.arctan2(np.sin(radians).mean(), np.cos(radians).mean())) % 360.0)
+        return {'heading': heading, 'markers': sorted(markers, key=abs),
+                'read_ms': round((time.perf_counter() - start) * 1000, 2)}
+
+class HeadingController:
+    """P-control on compass error -> small REL_X steps, only while FORWARD is held"""
+
+    LEG_TTL = 60.0              # s a target is held unless the tier that set it renews it
+
+    def __init__(self, vision, controller, pose=None, gain: float = 0.5, deadband_deg: float = 2.0,
+                 max_step: int = 40, rate_hz: float = 30.0, degrees_per_count: float = 0.12):
+        self.vision = vision
+        self.controller = controller
+        self.pose = pose                        # PoseEstimator: gets compass fixes, covers unreadable frames
+        self.reader = CompassReader(vision.hud_color_ranges["green_amber"])
+        self.gain = gain
+        self.deadband_deg = deadband_deg
+        self.max_step = max_step                # mouse counts per frame
+        self.rate_hz = rate_hz
+        self.degrees_per_count = degrees_per_count  # same calibration as PoseEstimator.degrees_per_pixel
+
+        self.target_bearing = None
+        self.follow_marker = False
+        self.expires_at = None
+        self.residual = 0.0
+        self.last_frame = None
+        self.running = False
+        self._lock = threading.Lock()
+        self.stats = {'frames': 0, 'corrections': 0, 'unreadable': 0, 'last_error_deg': None,
+                      'heading': None, 'on_course': False}
+
+    def set_target(self, bearing: Optional[float] = None, marker: bool = False, ttl: Optional[float] = LEG_TTL):
+        """Hold a compass bearing (0=N, 90=E) or steer onto the nearest compass marker for ttl seconds"""
+        with self._lock:
+            self.target_bearing = None if bearing is None else float(bearing) % 360.0
+            self.follow_marker = marker and bearing is None
+            self.expires_at = time.perf_counter() + ttl if ttl is not None and self.active else None
+            self.residual = 0.0
+        target = f"bearing {self.target_bearing:.0f}°" if self.target_bearing is not None else "marker" if marker else "none"
+        print(f"🧭 Heading target: {target}")
+
+    def clear_target(self):
+        self.set_target(None, False)
+
+    @property
+    def active(self) -> bool:
+        return self.target_bearing is not None or self.follow_marker
+
+    def start(self):
+        """Run the control loop on its own thread until stop()"""
+        if self.running:
+            return
+        self.running = True
+        threading.Thread(target=self._run, daemon=True, name="heading-control").start()
+
+    def stop(self):
+        self.running = False
+
+    def _run(self):
+        period = 1.0 / self.rate_hz
+        next_tick = time.perf_counter()
+        while self.running:
+            try:
+                self.step()
+            except Exception as error:
+                print(f"⚠️ Heading control error: {error}")
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()  # Fell behind; don't burst to catch up
+
+    def error_deg(self, reading: Dict) -> Optional[float]:
+        """Signed degrees to turn right to face the target (None if this frame can't tell)"""
+        if self.follow_marker:
+            return reading['markers'][0] if reading['markers'] else None
+        heading = reading['heading']
+        if heading is None and self.pose is not None:
+            heading = self.pose.heading  # Mouse-integrated; good for a few seconds between compass reads
+        return None if heading is None else angle_error(self.target_bearing, heading)
+
+    def update(self, error: float) -> int:
+        """One control step: mouse counts to move right (residuals carried between frames)"""
+        if abs(error) <= self.deadband_deg:
+            self.residual = 0.0
+            return 0
+        raw = self.gain * error / self.degrees_per_count + self.residual
+        dx = int(np.clip(round(raw), -self.max_step, self.max_step))
+        self.residual = raw - dx if abs(raw) <= self.max_step else 0.0
+        return dx
+
+    def step(self) -> Optional[int]:
+        """Process the newest compass frame, if there is one; returns the correction applied"""
+        with self._lock:
+            if self.expires_at is not None and time.perf_counter() >= self.expires_at:
+                self.target_bearing, self.follow_marker, self.expires_at = None, False, None
+                print("🧭 Heading target expired")
+
+        image = self.vision.scheduler.get_latest("COMPASS", max_age=0.2)
+        if image is None or image is self.last_frame:
+            return None
+        self.last_frame = image
+
+        reading = self.reader.read(image)
+        self.stats['frames'] += 1
+        if reading['heading'] is not None:
+            self.stats['heading'] = round(reading['heading'], 1)
+            if self.pose is not None:
+                self.pose.on_compass(reading['heading'])
+        else:
+            self.stats['unreadable'] += 1
+
+        # Only steer while walking; a standing character is someone else's business
+        with self._lock:
+            if not self.active or "FORWARD" not in self.controller.held_keys:
+                return None
+            error = self.error_deg(reading)
+            if error is None:
+                return None
+            dx = self.update(error)
+
+        self.stats['last_error_deg'] = round(error, 1)
+        self.stats['on_course'] = dx == 0
+        if dx:
+            self.controller.move_mouse(dx, 0)
+            self.stats['corrections'] += 1
+        return dx
+
+def simulate(controller: HeadingController, start_heading: float, frames: int = 90,
+             drift_deg: float = 0.0) -> List[float]:
+    """Closed-loop heading errors against an ideal camera (one-frame latency), for tuning"""
+    heading = start_heading
+    errors = []
+    for _ in range(frames):
+        error = angle_error(controller.target_bearing, heading)
+        errors.append(error)
+        dx = controller.update(error)
+        heading = (heading + dx * controller.degrees_per_count + drift_deg) % 360.0
+    return errors
+
+if __name__ == "__main__":
+    # Settling check: 90° turn and a walk with steady drift (e.g. a slope pushing sideways)
+    class _Stub:
+        hud_color_ranges = {"green_amber": ([20, 100, 100], [40, 255, 255])}
+
+    for gain in (0.3, 0.5, 0.8):
+        heading = HeadingController(_Stub(), None, gain=gain)
+        heading.target_bearing = 90.0
+        for name, start, drift in (("turn", 0.0, 0.0), ("drift", 90.0, 0.5)):
+            errors = simulate(heading, start, drift_deg=drift)
+            settled = next((i for i, error in enumerate(errors) if all(abs(e) <= heading.deadband_deg + abs(drift) for e in errors[i:])), None)
+            result = f"{settled / heading.rate_hz * 1000:.0f}ms" if settled is not None else "never"
+            print(f"gain={gain} {name:5s} -> settled {result}, final error {errors[-1]:+.2f}°")
@@ -2,7 +2,13 @@
 # FIXED VERSION: Proper Fallout 76 key mappings that actually work
 
 import time
+import heapq
+import array
+import itertools
+import threading
+from collections import deque
 from evdev import UInput, ecodes as e
+import numpy as np
 
 # --- CORRECT Fallout 76 Key Mapping ---
 ACTION_TO_KEY = {
@@ -28,6 +34,8 @@ ACTION_TO_KEY = {
     "TAB": e.KEY_TAB,       # Pip-Boy
     "ESC": e.KEY_ESC,       # Menu/back
     "ENTER": e.KEY_ENTER,   # Confirm
+    "UP": e.KEY_UP,         # Menu/list navigation
+    "DOWN": e.KEY_DOWN,     # Menu/list navigation
 
     # Other F76 keys
     "C": e.KEY_C,           # Character
@@ -36,19 +44,253 @@ ACTION_TO_KEY = {
     "CTRL": e.KEY_LEFTCTRL, # Sneak
 }
 
+# Easing profiles: fraction of the total motion completed at normalized time t
+EASING = {
+    "linear": lambda t: t,
+    "ease_in": lambda t: t * t,
+    "ease_out": lambda t: 1 - (1 - t) * (1 - t),
+    "ease_in_out": lambda t: t * t * (3 - 2 * t),
+}
+
+SPIN_THRESHOLD = 0.002  # s: sleep until this close to a deadline, then spin on perf_counter
+
+def sleep_until(deadline):
+    """Hybrid sleep/spin: OS sleep for the bulk, busy-wait the last couple of ms"""
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return
+        if remaining > SPIN_THRESHOLD:
+            time.sleep(remaining - SPIN_THRESHOLD)
+
+def plan_motion(dx, dy, duration, easing="ease_in_out", step_hz=125):
+    """[(t_offset, step_dx, step_dy)] whose integer steps sum exactly to (dx, dy)
+
+    Steps are differences of the rounded cumulative eased position, so the
+    fractional part carries forward instead of being floored away.
+    """
+    ease = EASING.get(easing, EASING["linear"])
+    steps = max(1, int(round(duration * step_hz)))
+    plan = []
+    prev_x = prev_y = 0
+    for i in range(1, steps + 1):
+        fraction = ease(i / steps)
+        x, y = int(round(dx * fraction)), int(round(dy * fraction))
+        if x != prev_x or y != prev_y:
+            plan.append(((i - 1) * duration / steps, x - prev_x, y - prev_y))
+        prev_x, prev_y = x, y
+    return plan
+
+class TimingHistogram:
+    """Rolling histogram of millisecond samples over the last `window` events"""
+
+    BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100)
+
+    def __init__(self, window=500):
+        self.samples = deque(maxlen=window)
+
+    def add(self, ms):
+        self.samples.append(ms)
+
+    def summary(self):
+        if not self.samples:
+            return {'count': 0}
+        ordered = sorted(self.samples)
+        counts = {}
+        for ms in ordered:
+            bucket = next((f"<={edge}" for edge in self.BUCKETS_MS if abs(ms) <= edge), f">{self.BUCKETS_MS[-1]}")
+            counts[bucket] = counts.get(bucket, 0) + 1
+        return {
+            'count': len(ordered),
+            'mean': round(sum(ordered) / len(ordered), 3),
+            'p50': round(ordered[len(ordered) // 2], 3),
+            'p95': round(ordered[int(len(ordered) * 0.95)], 3) if len(ordered) > 1 else round(ordered[0], 3),
+            'min': round(ordered[0], 3),
+            'max': round(ordered[-1], 3),
+            'buckets': counts,  # by |ms|, so early and late samples share a bucket
+        }
+
+class ActionHandle:
+    """An in-flight scheduled action, returned immediately by ActionController.schedule
+
+    Doubles as the action's cancellation token: cancel() releases anything it
+    holds right away and turns its remaining timeline events into no-ops.
+    """
+
+    def __init__(self, action, start, end, priority=0, controller=None):
+        self.action = action
+        self.start = start      # perf_counter times
+        self.end = end
+        self.priority = priority
+        self.state = "pending"  # pending -> active -> done | cancelled
+        self.requested_at = time.perf_counter()
+        self.started_at = None
+        # perf_counter marks: received, decided, down_write/down_syn, up_write/up_syn
+        self.timestamps = {'received': self.requested_at}
+        self.done = threading.Event()
+        self._controller = controller
+
+    @property
+    def remaining(self):
+        return max(0.0, self.end - time.perf_counter())
+
+    @property
+    def cancelled(self):
+        return self.state == "cancelled"
+
+    @property
+    def finished(self):
+        return self.done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the action has finished or been cancelled (True) or timeout (False)"""
+        return self.done.wait(timeout)
+
+    def cancel(self):
+        """Stop now, releasing any held key; returns False if it had already finished"""
+        return self._controller.cancel(self) if self._controller else False
+
+class InputScheduler:
+    """Dedicated thread firing timestamped input callbacks from a min-heap timeline"""
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()  # Keeps same-time events in submission order
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def at(self, when, callback):
+        """Run callback() at perf_counter time `when` (immediately if already past)"""
+        with self._cond:
+            heapq.heappush(self._heap, (when, next(self._seq), callback))
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._heap:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                when = self._heap[0][0]
+                remaining = when - time.perf_counter()
+                if remaining > SPIN_THRESHOLD:
+                    # Woken early by at() or by the timeout; re-evaluate the head either way
+                    self._cond.wait(remaining - SPIN_THRESHOLD)
+                    continue
+
+            # Spin the last stretch outside the lock so at() callers aren't blocked
+            sleep_until(when)
+            with self._cond:
+                now = time.perf_counter()
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap)[2])
+
+            for callback in due:
+                try:
+                    callback()
+                except Exception as error:
+                    print(f"⚠️ Scheduled input failed: {error}")
+
+class RecordingDevice:
+    """Drop-in for UInput that records every event instead of injecting it (no /dev/uinput, no root)
+
+    Events land in compact parallel arrays: perf_counter timestamps (monotonic,
+    same clock as the scheduler) and type/code/value. syn() is recorded as
+    EV_SYN/SYN_REPORT so batching is visible in the stream.
+    """
+
+    def __init__(self, capabilities=None, name="Recording_F76_Controller"):
+        self.name = name
+        self.capabilities = capabilities
+        self.times = array.array('d')
+        self.codes = array.array('l')   # type, code, value interleaved
+        self.closed = False
+
+    def write(self, event_type, code, value):
+        self.times.append(time.perf_counter())
+        self.codes.extend((event_type, code, value))
+
+    def syn(self):
+        self.write(e.EV_SYN, e.SYN_REPORT, 0)
+
+    def close(self):
+        self.closed = True
+
+    def clear(self):
+        del self.times[:]
+        del self.codes[:]
+
+    def __len__(self):
+        return len(self.times)
+
+    def events(self):
+        """Structured numpy view: fields t, type, code, value"""
+        events = np.zeros(len(self.times), dtype=[('t', 'f8'), ('type', 'i4'), ('code', 'i4'), ('value', 'i4')])
+        events['t'] = np.frombuffer(self.times, dtype=np.float64)
+        codes = np.frombuffer(self.codes, dtype=np.dtype(f'i{self.codes.itemsize}')).reshape(-1, 3)
+        events['type'], events['code'], events['value'] = codes[:, 0], codes[:, 1], codes[:, 2]
+        return events
+
+    def holds(self, action_name):
+        """[(down_t, up_t)] for an action's key; up_t is None while still held"""
+        events = self.events()
+        key = events[(events['type'] == e.EV_KEY) & (events['code'] == ACTION_TO_KEY[action_name])]
+        holds = []
+        for t, value in zip(key['t'], key['value']):
+            if value == 1:
+                holds.append((float(t), None))
+            elif holds and holds[-1][1] is None:
+                holds[-1] = (holds[-1][0], float(t))
+        return holds
+
+    def rel_totals(self):
+        """Summed (REL_X, REL_Y) mouse counts"""
+        events = self.events()
+        rel = events[events['type'] == e.EV_REL]
+        return (int(rel['value'][rel['code'] == e.REL_X].sum()), int(rel['value'][rel['code'] == e.REL_Y].sum()))
+
+    def syn_count(self):
+        return int(np.count_nonzero(self.events()['type'] == e.EV_SYN))
+
 class ActionController:
     """Fixed controller with correct F76 mappings"""
 
-    def __init__(self):
-        self.device = None
-        capabilities = {
-            e.EV_KEY: list(ACTION_TO_KEY.values()),
-            e.EV_REL: [e.REL_X, e.REL_Y],
-        }
+    WATCHDOG_PERIOD = 0.05      # s between held-key checks
+    DEADLINE_GRACE = 0.25       # s a key may outlive its scheduled release before it's forced up
+    STALL_TIMEOUT = 10.0        # s without a decision-loop heartbeat before everything is released
 
+    def __init__(self, device=None):
+        """device: anything with write/syn/close (default: a real UInput; RecordingDevice for headless runs)"""
+        self.device = None
+        # Callbacks fed every emitted input: (event, action, value)
+        self.listeners = []
+        # Keys can be held by several overlapping actions; only the first down / last up hit the device
+        self.key_refs = {}
+        # Exact device state: action -> perf_counter of the down write, and when it should be up by
+        self.held_keys = {}
+        self.key_deadlines = {}
+        self.last_heartbeat = None
+        self.watchdog_stats = {'deadline_releases': 0, 'stall_releases': 0, 'last_forced': None}
+        self._device_lock = threading.Lock()
+        # Scheduled actions not yet finished, for cancellation/preemption
+        self.in_flight = set()
+        self._handles_lock = threading.RLock()
+        # Per action: queue_delay (first write vs planned time), reaction (decision to write), duration_error
+        self.timing = {}
+        self.motion_stats = {'looks': 0, 'shortfalls': 0, 'last': None}
+        self.preempt_stats = {'preemptions': 0, 'cancelled': 0, 'coalesced': 0, 'last_reaction_ms': 0.0, 'avg_reaction_ms': 0.0, 'avg_cut_short_ms': 0.0}
         try:
             print("🎮 Creating Fixed Fallout 76 Action Controller...")
-            self.device = UInput(capabilities, name="Fixed_F76_Controller")
+            self.device = device if device is not None else self._open_device()
             print("✅ Fixed Action Controller ready!")
         except Exception as error:
             print(f"\n❌ PERMISSION ERROR ❌")
@@ -57,6 +299,48 @@ class ActionController:
             print("   sudo python3 main_bot.py")
             raise error
 
+        # Timeline thread for non-blocking schedule()/schedule_look()
+        self.scheduler = InputScheduler()
+
+        # Releases keys whose owner is late or whose decision loop has stalled
+        self._watchdog_stop = threading.Event()
+        self._watchdog = threading.Thread(target=self._watchdog_loop, daemon=True, name="input-watchdog")
+        self._watchdog.start()
+
+    def _open_device(self):
+        """Keyboard + relative mouse uinput device (backends override this and the _write_* hooks)"""
+        capabilities = {
+            e.EV_KEY: list(ACTION_TO_KEY.values()),
+            e.EV_REL: [e.REL_X, e.REL_Y],
+        }
+        return UInput(capabilities, name="Fixed_F76_Controller")
+
+    def _write_key(self, action_name, value):
+        """Device write for an action's down (1) / up (0); called under _device_lock, before syn()"""
+        self.device.write(e.EV_KEY, ACTION_TO_KEY[action_name], value)
+
+    def _write_look(self, dx, dy):
+        """Device write for a relative look step; returns listener notices"""
+        notices = []
+        if dx:
+            self.device.write(e.EV_REL, e.REL_X, dx)
+            notices.append(("look", "REL_X", dx))
+        if dy:
+            self.device.write(e.EV_REL, e.REL_Y, dy)
+            notices.append(("look", "REL_Y", dy))
+        return notices
+
+    def add_listener(self, callback):
+        """Register callback(event, action, value) for 'down'/'up' keys and 'look' REL_X/REL_Y deltas"""
+        self.listeners.append(callback)
+
+    def _notify(self, event, action, value=None):
+        for callback in self.listeners:
+            try:
+                callback(event, action, value)
+            except Exception as error:
+                print(f"⚠️ Input listener error: {error}")
+
     def press(self, action_name, duration=0.1):
         """Execute key press with proper F76 timing"""
 
@@ -83,56 +367,408 @@ class ActionController:
             return False
 
         try:
-            # Press key
-            self.device.write(e.EV_KEY, key_code, 1)
-            self.device.syn()
+            self._set_deadline(action_name, time.perf_counter() + duration)
+            down, _ = self._key_down(action_name)
             time.sleep(duration)
-
-            # Release key
-            self.device.write(e.EV_KEY, key_code, 0)
-            self.device.syn()
+            up, _ = self._key_up(action_name)
+            self._record_timing(action_name, 'duration_error', (up - down) - duration)
             return True
 
         except Exception as e:
             print(f"❌ Failed to execute {action_name}: {e}")
             return False
 
-    def smooth_look(self, dx, dy, duration=0.1):
-        """Smooth mouse movement for camera control"""
+    def schedule(self, action_name, duration=0.1, delay=0.0, priority=0, preempt=False, decided_at=None):
+        """Non-blocking press: queue key-down/key-up on the input timeline and return a handle
+
+        With preempt=True, every in-flight action of lower priority is cancelled
+        (keys released) before this one starts, in the same call. decided_at
+        (perf_counter when the decision was made) feeds the reaction-latency stats.
+        """
+        action_name = action_name.upper()
+        if action_name not in ACTION_TO_KEY:
+            print(f"❌ Unknown action: {action_name}")
+            return None
+
+        if preempt:
+            self.preempt(priority)
+
+        start = time.perf_counter() + delay
+        handle = ActionHandle(action_name, start, start + duration, priority, self)
+        if decided_at is not None:
+            handle.timestamps['decided'] = decided_at
+        with self._handles_lock:
+            self.in_flight.add(handle)
+
+        def press_down():
+            with self._handles_lock:
+                if handle.state != "pending":
+                    return
+                handle.state = "active"
+                handle.started_at = time.perf_counter()
+                self._set_deadline(action_name, handle.end)
+                written, synced = self._key_down(action_name)
+            handle.timestamps['down_write'], handle.timestamps['down_syn'] = written, synced
+            self._record_timing(action_name, 'queue_delay', written - handle.start)
+            if decided_at is not None:
+                self._record_reaction(written - decided_at)
+                self._record_timing(action_name, 'reaction', written - decided_at)
+
+        def release():
+            with self._handles_lock:
+                # Stale if extend() pushed the deadline out after this event was queued
+                if handle.state != "active" or time.perf_counter() < handle.end - 0.0005:
+                    return
+                handle.state = "done"
+                self.in_flight.discard(handle)
+                written, synced = self._key_up(action_name)
+            handle.timestamps['up_write'], handle.timestamps['up_syn'] = written, synced
+            held = written - handle.timestamps['down_write']
+            self._record_timing(action_name, 'duration_error', held - (handle.end - handle.start))
+            handle.done.set()
+
+        handle._release = release
+        self.scheduler.at(start, press_down)
+        self.scheduler.at(handle.end, release)
+        return handle
+
+    def extend(self, handle, duration, priority=None):
+        """Keep a held action going until now+duration instead of releasing and re-pressing"""
+        with self._handles_lock:
+            if handle.state not in ("pending", "active") or not hasattr(handle, "_release"):
+                return False
+            new_end = time.perf_counter() + duration
+            if priority is not None:
+                handle.priority = max(handle.priority, priority)
+            if new_end > handle.end:
+                handle.end = new_end
+                if handle.state == "active":
+                    self._set_deadline(handle.action, new_end)
+                self.scheduler.at(new_end, handle._release)
+        self.preempt_stats['coalesced'] += 1
+        return True
+
+    def schedule_look(self, dx, dy, duration=0.1, delay=0.0, priority=0, easing="ease_in_out"):
+        """Non-blocking smooth_look: eased mouse steps spread over the input timeline"""
+        start = time.perf_counter() + delay
+        handle = ActionHandle("SMOOTH_LOOK", start, start + duration, priority, self)
+        handle.state = "active"
+        handle.started_at = start
+        with self._handles_lock:
+            self.in_flight.add(handle)
+
+        plan = plan_motion(dx, dy, duration, easing)
+        achieved = [0, 0]
+        errors = []
+
+        def look_step(planned, step_dx, step_dy):
+            if handle.cancelled:
+                return
+            written, _ = self.move_mouse(step_dx, step_dy)
+            errors.append(written - planned)
+            self._record_timing("SMOOTH_LOOK", 'queue_delay', written - planned)
+            achieved[0] += step_dx
+            achieved[1] += step_dy
+
+        def finish():
+            with self._handles_lock:
+                if handle.cancelled:
+                    return
+                handle.state = "done"
+                self.in_flight.discard(handle)
+            elapsed = time.perf_counter() - start
+            self._record_timing("SMOOTH_LOOK", 'duration_error', elapsed - duration)
+            handle.report = self._motion_report((dx, dy), achieved, duration, elapsed, errors)
+            handle.done.set()
+
+        for offset, step_dx, step_dy in plan:
+            self.scheduler.at(start + offset, lambda t=start + offset, sx=step_dx, sy=step_dy: look_step(t, sx, sy))
+        self.scheduler.at(handle.end, finish)
+        return handle
+
+    def _motion_report(self, requested, achieved, duration, elapsed, errors):
+        """Requested vs achieved counts and pacing error for one look"""
+        report = {
+            'requested': tuple(requested),
+            'achieved': tuple(achieved),
+            'duration_requested_ms': round(duration * 1000, 2),
+            'duration_actual_ms': round(elapsed * 1000, 2),
+            'mean_step_error_ms': round(sum(errors) / len(errors) * 1000, 3) if errors else 0.0,
+            'max_step_error_ms': round(max(errors) * 1000, 3) if errors else 0.0,
+        }
+        self.motion_stats['looks'] += 1
+        self.motion_stats['last'] = report
+        if report['achieved'] != report['requested']:
+            self.motion_stats['shortfalls'] += 1
+        return report
+
+    def cancel(self, handle):
+        """Cancel a scheduled action, releasing its key if it is currently held"""
+        with self._handles_lock:
+            if handle.state in ("done", "cancelled"):
+                return False
+            was_active = handle.state == "active"
+            handle.state = "cancelled"
+            self.in_flight.discard(handle)
+            if was_active and handle.action in ACTION_TO_KEY:
+                handle.timestamps['up_write'], handle.timestamps['up_syn'] = self._key_up(handle.action)
+            # Timelines may be holding several keys of their own
+            for action_name, count in getattr(handle, "held", {}).items():
+                for _ in range(count):
+                    self._key_up(action_name)
+        self.preempt_stats['cancelled'] += 1
+        handle.done.set()
+        return True
+
+    def preempt(self, priority):
+        """Cancel every in-flight action below `priority`; returns how many were cut"""
+        with self._handles_lock:
+            victims = [handle for handle in self.in_flight if handle.priority < priority]
+        cut_short_ms = [handle.remaining * 1000 for handle in victims]
+        for handle in victims:
+            self.cancel(handle)
+
+        if victims:
+            stats = self.preempt_stats
+            stats['preemptions'] += 1
+            # Time the old actions would still have blocked a reaction without preemption
+            cut = sum(cut_short_ms) / len(cut_short_ms)
+            stats['avg_cut_short_ms'] = 0.8 * stats['avg_cut_short_ms'] + 0.2 * cut if stats['preemptions'] > 1 else cut
+        return len(victims)
+
+    def _record_reaction(self, seconds):
+        """Decision-to-key-down latency"""
+        reaction_ms = seconds * 1000
+        stats = self.preempt_stats
+        stats['last_reaction_ms'] = reaction_ms
+        stats['avg_reaction_ms'] = 0.8 * stats['avg_reaction_ms'] + 0.2 * reaction_ms if stats['avg_reaction_ms'] else reaction_ms
+
+    def _record_timing(self, action_name, metric, seconds):
+        per_action = self.timing.setdefault(action_name, {})
+        if metric not in per_action:
+            per_action[metric] = TimingHistogram()
+        per_action[metric].add(seconds * 1000)
+
+    def timing_stats(self):
+        """{action: {metric: histogram summary}} in ms, for the stats surface"""
+        return {action: {metric: histogram.summary() for metric, histogram in list(metrics.items())}
+                for action, metrics in list(self.timing.items())}
+
+    def _key_down(self, action_name):
+        return self.emit([("down", action_name)])
+
+    def _key_up(self, action_name):
+        return self.emit([("up", action_name)])
+
+    def emit(self, batch):
+        """Write events that share a timestamp under a single syn(); returns (first write, syn) times
+
+        batch: [("down"|"up", action) | ("look", (dx, dy))]. Key refcounts
+        still apply, so only a key's first down / last up reaches the device.
+        """
+        notices = []
+        written = None
+        with self._device_lock:
+            for kind, value in batch:
+                if kind == "look":
+                    written = written or time.perf_counter()
+                    notices.extend(self._write_look(int(value[0]), int(value[1])))
+                    continue
+
+                refs = self.key_refs.get(value, 0) + (1 if kind == "down" else -1)
+                if refs > 0:
+                    self.key_refs[value] = refs
+                else:
+                    self.key_refs.pop(value, None)
+                if (kind == "down" and refs == 1) or (kind == "up" and refs <= 0):
+                    written = written or time.perf_counter()
+                    self._write_key(value, 1 if kind == "down" else 0)
+                    notices.append((kind, value, None))
+                    if kind == "down":
+                        self.held_keys[value] = written
+                    else:
+                        self.held_keys.pop(value, None)
+                        self.key_deadlines.pop(value, None)
+            if notices:
+                self.device.syn()
+            synced = time.perf_counter()
+        for event, action, value in notices:
+            self._notify(event, action, value)
+        # Nothing hit the device (e.g. key already held by another action): report the call time
+        return (written or synced), synced
+
+    def schedule_timeline(self, label, timeline, duration, delay=0.0, priority=0, decided_at=None):
+        """Play a compiled [(offset, batch)] timeline (see input_macros); returns a handle
+
+        Cancelling the handle releases whatever keys the timeline still holds.
+        """
+        start = time.perf_counter() + delay
+        handle = ActionHandle(label, start, start + duration, priority, self)
+        handle.held = {}
+        if decided_at is not None:
+            handle.timestamps['decided'] = decided_at
+        with self._handles_lock:
+            self.in_flight.add(handle)
+
+        def play(batch, planned, first):
+            with self._handles_lock:
+                if handle.cancelled or handle.state == "done":
+                    return
+                if handle.state == "pending":
+                    handle.state = "active"
+                    handle.started_at = time.perf_counter()
+                for kind, value in batch:
+                    if kind in ("down", "up"):
+                        handle.held[value] = handle.held.get(value, 0) + (1 if kind == "down" else -1)
+                    if kind == "down":
+                        self._set_deadline(value, handle.end)
+                written, synced = self.emit(batch)
+            self._record_timing(label, 'queue_delay', written - planned)
+            if first:
+                handle.timestamps['down_write'], handle.timestamps['down_syn'] = written, synced
+                if decided_at is not None:
+                    self._record_reaction(written - decided_at)
+                    self._record_timing(label, 'reaction', written - decided_at)
+
+        def finish():
+            with self._handles_lock:
+                if handle.cancelled:
+                    return
+                handle.state = "done"
+                self.in_flight.discard(handle)
+            self._record_timing(label, 'duration_error', time.perf_counter() - handle.end)
+            handle.done.set()
+
+        for index, (offset, batch) in enumerate(timeline):
+            self.scheduler.at(start + offset, lambda b=batch, t=start + offset, f=index == 0: play(b, t, f))
+        self.scheduler.at(handle.end, finish)
+        return handle
+
+    def smooth_look(self, dx, dy, duration=0.1, easing="ease_in_out"):
+        """Smooth mouse movement for camera control (blocking); returns the motion report"""
         print(f"👀 Looking: dx={dx}, dy={dy}")
 
-        steps = max(10, int(abs(dx) + abs(dy)) // 5)
+        start = time.perf_counter()
+        achieved = [0, 0]
+        errors = []
+        for offset, step_dx, step_dy in plan_motion(dx, dy, duration, easing):
+            sleep_until(start + offset)
+            errors.append(time.perf_counter() - (start + offset))
+            self.move_mouse(step_dx, step_dy)
+            achieved[0] += step_dx
+            achieved[1] += step_dy
+        sleep_until(start + duration)
+
+        return self._motion_report((dx, dy), achieved, duration, time.perf_counter() - start, errors)
 
-        for step in range(steps):
-            step_dx = dx // steps
-            step_dy = dy // steps
+    def move_mouse(self, dx, dy):
+        """Single relative mouse step, no pacing or logging (for closed-loop callers)"""
+        return self.emit([("look", (dx, dy))])
 
-            self.device.write(e.EV_REL, e.REL_X, step_dx)
-            self.device.write(e.EV_REL, e.REL_Y, step_dy)
-            self.device.syn()
-            time.sleep(duration / steps)
+    def _set_deadline(self, action_name, deadline):
+        """Latest time the key is expected to be released by its current owners"""
+        with self._device_lock:
+            self.key_deadlines[action_name] = max(self.key_deadlines.get(action_name, 0.0), deadline)
+
+    def heartbeat(self):
+        """Called by the decision loop every iteration; a stale heartbeat releases all held keys"""
+        self.last_heartbeat = time.perf_counter()
+
+    def _watchdog_loop(self):
+        while not self._watchdog_stop.wait(self.WATCHDOG_PERIOD):
+            try:
+                self._watchdog_check()
+            except Exception as error:
+                print(f"⚠️ Input watchdog error: {error}")
+
+    def _watchdog_check(self):
+        now = time.perf_counter()
+        with self._device_lock:
+            held = dict(self.held_keys)
+            deadlines = dict(self.key_deadlines)
+        if not held:
+            return
+
+        if self.last_heartbeat is not None and now - self.last_heartbeat > self.STALL_TIMEOUT:
+            print(f"🚨 Decision loop stalled for {now - self.last_heartbeat:.1f}s - releasing {sorted(held)}")
+            self.watchdog_stats['stall_releases'] += 1
+            self.watchdog_stats['last_forced'] = sorted(held)
+            self.release_all()
+            return
+
+        # No deadline means nobody owns the key any more (e.g. an exception between down and up)
+        overdue = [action for action in held if now > deadlines.get(action, held[action]) + self.DEADLINE_GRACE]
+        if overdue:
+            print(f"🚨 Keys held past their deadline - releasing {sorted(overdue)}")
+            self.watchdog_stats['deadline_releases'] += len(overdue)
+            self.watchdog_stats['last_forced'] = sorted(overdue)
+            for action_name in overdue:
+                self._force_release(action_name)
+
+    def _force_release(self, action_name):
+        """Cancel every action holding this key, then write key-up for any orphaned reference"""
+        with self._handles_lock:
+            owners = [handle for handle in self.in_flight
+                      if handle.state == "active" and (handle.action == action_name or getattr(handle, "held", {}).get(action_name, 0) > 0)]
+        for handle in owners:
+            self.cancel(handle)
+
+        with self._device_lock:
+            orphaned = self.held_keys.pop(action_name, None) is not None
+            self.key_refs.pop(action_name, None)
+            self.key_deadlines.pop(action_name, None)
+            if orphaned:
+                self._write_key(action_name, 0)
+                self.device.syn()
+        if orphaned:
+            self._notify("up", action_name)
+
+    def release_all(self):
+        """Cancel all in-flight actions and release every key the device still holds"""
+        with self._handles_lock:
+            handles = list(self.in_flight)
+        held = list(self.held_keys)
+        for handle in handles:
+            self.cancel(handle)
+        for action_name in list(self.held_keys):
+            self._force_release(action_name)
+        return held
 
     def emergency_stop_all(self):
         """Release all keys in case of stuck state"""
         print("🚨 Emergency: Releasing all keys")
-
-        # Release all possible keys
-        for key_code in ACTION_TO_KEY.values():
-            if isinstance(key_code, int):  # Skip mouse buttons for now
-                try:
-                    self.device.write(e.EV_KEY, key_code, 0)
-                except:
-                    pass
-
-        self.device.syn()
+        released = self.release_all()
+        with self._device_lock:
+            self.key_refs.clear()
+        if released:
+            print(f"🔓 Released: {', '.join(released)}")
 
     def close(self):
         """Clean shutdown"""
         if self.device:
             print("🔧 Shutting down Action Controller...")
+            self.scheduler.stop()
+            self._watchdog_stop.set()
             self.emergency_stop_all()
             time.sleep(0.1)
             self.device.close()
             print("✅ Action Controller closed safely")
         else:
             print("⚠️ Action Controller was not initialized")
+
+if __name__ == "__main__":
+    # Headless timing benchmark against the recording backend
+    device = RecordingDevice()
+    controller = ActionController(device=device)
+    for _ in range(50):
+        controller.schedule("FORWARD", 0.02, decided_at=time.perf_counter()).wait()
+    look = controller.schedule_look(123, -37, 0.2)
+    look.wait()
+
+    holds = device.holds("FORWARD")
+    print(f"FORWARD holds: {len(holds)}, mean {np.mean([up - down for down, up in holds]) * 1000:.2f}ms (requested 20ms)")
+    print(f"Look totals: {device.rel_totals()} (requested (123, -37)), {device.syn_count()} syn reports, {len(device)} events")
+    for action, metrics in controller.timing_stats().items():
+        for metric, summary in metrics.items():
+            print(f"{action:12s} {metric:15s} p50={summary['p50']}ms p95={summary['p95']}ms max={summary['max']}ms")
+    controller.close()
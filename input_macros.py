@@ -0,0 +1,185 @@
+# input_macros.py
+# Multi-step input sequences declared as data and compiled to one event timeline
+# A macro is a list of steps; compiling turns it into [(offset, batch)] where
+# every write sharing a timestamp lands under a single syn(), and all timing
+# is enforced by the controller's input scheduler instead of Python sleeps.
+#
+# Steps:
+#   {"tap": ACTION, "hold": s}        key down now, up after hold; advances by hold
+#   {"down": ACTION} / {"up": ACTION} edge only, does not advance
+#   {"wait": s}                       advance the cursor
+#   {"look": [dx, dy], "duration": s, "easing": name}
+#   {"macro": NAME}                   inline another macro
+# Add "parallel": true to a tap/look to start it without advancing the cursor.
+
+import json
+import os
+from typing import Dict, List, Tuple
+
+from input_emulator import ACTION_TO_KEY, EASING, plan_motion
+
+DEFAULT_MACROS = {
+    "CHECK_MAP": {
+        "description": "open the map, read it, close it",
+        "steps": [{"tap": "M", "hold": 0.1}, {"wait": 2.0}, {"tap": "M", "hold": 0.1}],
+    },
+    "CAST_LINE": {
+        "description": "cast the fishing line and let the bobber settle",
+        # Sub-protocol 2.2.1: a single INTERACT casts; the bobber bounces for ~2s
+        "steps": [{"tap": "INTERACT", "hold": 0.05}, {"wait": 2.0}],
+    },
+    "REEL_IN": {
+        "description": "hook the fish on a bite",
+        "steps": [{"tap": "INTERACT", "hold": 0.05}],
+    },
+    "JUMP_FORWARD": {
+        "description": "run and jump over an obstacle",
+        "steps": [{"down": "FORWARD"}, {"wait": 0.15}, {"tap": "JUMP", "hold": 0.1}, {"wait": 0.6}, {"up": "FORWARD"}],
+    },
+    "UNSTUCK": {
+        "description": "back off while jumping, then sidestep",
+        "steps": [
+            {"down": "BACKWARD"}, {"tap": "JUMP", "hold": 0.1, "parallel": True}, {"wait": 0.6}, {"up": "BACKWARD"},
+            {"tap": "STRAFE_LEFT", "hold": 0.4},
+        ],
+    },
+    "SPRINT_FORWARD": {
+        "description": "sprint forward for two seconds",
+        "steps": [{"down": "SPRINT"}, {"down": "FORWARD"}, {"wait": 2.0}, {"up": "FORWARD"}, {"up": "SPRINT"}],
+    },
+}
+
+MACRO_FILE = "macros.json"
+EDGE_GAP = 1 / 60   # s: opposite edges of one key are at least a game frame apart, never in one syn()
+
+def compile_macro(steps: List[Dict], macros: Dict[str, Dict] = DEFAULT_MACROS,
+                  _depth: int = 0) -> Tuple[List[Tuple[float, List]], float]:
+    """Steps -> ([(offset, batch)], duration); raises ValueError on bad steps or keys left held"""
+    if _depth > 8:
+        raise ValueError("macro nesting too deep (recursive macro?)")
+
+    events = []         # (offset, order, kind, value)
+    cursor = 0.0
+    for step in steps:
+        parallel = step.get("parallel", False)
+        if "wait" in step:
+            cursor += float(step["wait"])
+        elif "tap" in step or "down" in step or "up" in step:
+            kind = "tap" if "tap" in step else "down" if "down" in step else "up"
+            action = step[kind].upper()
+            if action not in ACTION_TO_KEY:
+                raise ValueError(f"unknown action {action}")
+            if kind == "tap":
+                hold = float(step.get("hold", 0.1))
+                if hold <= 0:
+                    raise ValueError(f"tap {action} needs a positive hold (got {hold})")
+                events.append((cursor, len(events), "down", action))
+                events.append((cursor + hold, len(events), "up", action))
+                cursor += 0 if parallel else hold
+            else:
+                events.append((cursor, len(events), kind, action))
+        elif "look" in step:
+            dx, dy = step["look"]
+            duration = float(step.get("duration", 0.1))
+            easing = step.get("easing", "ease_in_out")
+            if easing not in EASING:
+                raise ValueError(f"unknown easing {easing}")
+            for offset, step_dx, step_dy in plan_motion(dx, dy, duration, easing):
+                events.append((cursor + offset, len(events), "look", (step_dx, step_dy)))
+            cursor += 0 if parallel else duration
+        elif "macro" in step:
+            name = step["macro"].upper()
+            if name not in macros:
+                raise ValueError(f"unknown macro {name}")
+            timeline, duration = compile_macro(macros[name]["steps"], macros, _depth + 1)
+            for offset, batch in timeline:
+                for kind, value in batch:
+                    events.append((cursor + offset, len(events), kind, value))
+            cursor += 0 if parallel else duration
+        else:
+            raise ValueError(f"unrecognised step {step}")
+
+    # A key's release and re-press in one report read as a single continuous hold, so
+    # an edge that comes too soon after the opposite edge is pushed back a frame, and
+    # every later edge of that key moves with it so the edges never reorder
+    shift = {}          # action -> accumulated delay
+    last_edge = {}      # action -> (offset, kind)
+    for offset, order, kind, value in sorted(events):
+        if kind not in ("down", "up"):
+            continue
+        offset += shift.get(value, 0.0)
+        if value in last_edge:
+            previous, previous_kind = last_edge[value]
+            if previous_kind != kind and offset < previous + EDGE_GAP:
+                shift[value] = shift.get(value, 0.0) + previous + EDGE_GAP - offset
+                offset = previous + EDGE_GAP
+        last_edge[value] = (offset, kind)
+        events[order] = (offset, order, kind, value)
+
+    # Group by timestamp (to the microsecond) so same-time writes share one syn()
+    timeline = []
+    held = {}
+    end = cursor
+    for offset, order, kind, value in sorted((round(offset, 6), order, kind, value)
+                                             for offset, order, kind, value in events):
+        end = max(end, offset)
+        if timeline and timeline[-1][0] == offset:
+            batch = timeline[-1][1]
+        else:
+            batch = []
+            timeline.append((offset, batch))
+        if kind == "look" and batch and batch[-1][0] == "look":
+            batch[-1] = ("look", (batch[-1][1][0] + value[0], batch[-1][1][1] + value[1]))
+        else:
+            batch.append((kind, value))
+        if kind in ("down", "up"):
+            held[value] = held.get(value, 0) + (1 if kind == "down" else -1)
+
+    stuck = [action for action, count in held.items() if count != 0]
+    if stuck:
+        raise ValueError(f"macro leaves keys unbalanced: {stuck}")
+    return timeline, end
+
+class MacroLibrary:
+    """Named macros (defaults plus an optional JSON file), compiled once and played by name"""
+
+    def __init__(self, path: str = MACRO_FILE):
+        self.macros = {name: dict(spec) for name, spec in DEFAULT_MACROS.items()}
+        self.compiled = {}
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def load(self, path: str):
+        """Merge macros from a JSON file of {NAME: {"description": ..., "steps": [...]}}"""
+        with open(path) as f:
+            loaded = json.load(f)
+        for name, spec in loaded.items():
+            self.macros[name.upper()] = spec
+        self.compiled.clear()
+        # Compile up front so a bad file fails at startup, not mid-fight
+        for name in self.macros:
+            self.compile(name)
+        print(f"📜 Loaded {len(loaded)} macros from {path}")
+
+    def __contains__(self, name) -> bool:
+        return isinstance(name, str) and name.upper() in self.macros
+
+    def names(self) -> List[str]:
+        return sorted(self.macros)
+
+    def describe(self) -> str:
+        """One line per macro, for LLM prompts"""
+        return "\n".join(f"{name}: {self.macros[name].get('description', '')}" for name in self.names())
+
+    def compile(self, name: str) -> Tuple[List[Tuple[float, List]], float]:
+        name = name.upper()
+        if name not in self.compiled:
+            self.compiled[name] = compile_macro(self.macros[name]["steps"], self.macros)
+        return self.compiled[name]
+
+    def play(self, controller, name: str, delay: float = 0.0, priority: int = 0, decided_at=None):
+        """Schedule a macro on the controller's input timeline; returns its handle (non-blocking)"""
+        timeline, duration = self.compile(name)
+        print(f"📜 Macro {name.upper()} ({len(timeline)} writes over {duration:.2f}s)")
+        return controller.schedule_timeline(name.upper(), timeline, duration, delay=delay,
+                                            priority=priority, decided_at=decided_at)
@@ -0,0 +1,184 @@
+# inventory_scanner.py
+# Incremental Pip-Boy inventory reader
+# Scrolls the Pip-Boy item list, OCRs each visible row and caches rows by
+# image hash so a rescan only pays OCR for rows that actually changed.
+
+import re
+import time
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import cv2
+import mss
+
+@dataclass
+class InventoryItem:
+    """One row of the Pip-Boy item list"""
+    name: str
+    quantity: int = 1
+    raw_text: str = ""
+
+@dataclass
+class InventorySnapshot:
+    """Structured result of one inventory scan"""
+    items: List[InventoryItem] = field(default_factory=list)
+    timestamp: float = 0.0
+    rows_seen: int = 0
+    rows_ocr: int = 0
+    scan_seconds: float = 0.0
+
+    def names(self) -> List[str]:
+        return [item.name for item in self.items]
+
+    def count(self, name: str) -> int:
+        """Total quantity of items whose name contains `name` (case-insensitive)"""
+        name = name.lower()
+        return sum(item.quantity for item in self.items if name in item.name.lower())
+
+class PipBoyInventoryScanner:
+    """Reads the Pip-Boy inventory list page by page with a row-hash OCR cache"""
+
+    # Row pitch of the item list at the 1920x1080 base resolution
+    BASE_ROW_HEIGHT = 40
+    MAX_PAGES = 40
+
+    # "Stimpak (12)" / "10mm Round (250)"
+    _QUANTITY_PATTERN = re.compile(r"^(.*?)\s*\((\d+)\)\s*$")
+
+    def __init__(self, vision, controller, settle_time: float = 0.25):
+        self.vision = vision
+        self.controller = controller
+        self.settle_time = settle_time
+
+        # row hash -> parsed item (None for blank/unreadable rows)
+        self.row_cache: Dict[str, Optional[InventoryItem]] = {}
+        self.last_snapshot: Optional[InventorySnapshot] = None
+
+    def scan(self, open_pipboy: bool = True) -> InventorySnapshot:
+        """Scroll the whole list once and return a structured snapshot"""
+
+        start = time.time()
+        snapshot = InventorySnapshot(timestamp=start)
+        previous_page = None
+        previous_selected = None
+        stalled = 0
+
+        if open_pipboy:
+            self.controller.press("TAB", 0.1)
+            time.sleep(0.6)  # Pip-Boy open animation
+
+        try:
+            # Our own mss handle: scans run on a worker thread (asyncio.to_thread)
+            with mss.mss() as sct:
+                for _ in range(self.MAX_PAGES):
+                    page = self.vision.capture_roi_image("PIPBOY_LIST", sct=sct)
+                    if page is None:
+                        print("⚠️ Pip-Boy list ROI not calibrated")
+                        break
+
+                    rows = self._split_rows(np.array(page.convert("L")))
+                    page_hashes = [row_hash for row_hash, _ in rows]
+                    selected = self._selected_row(rows)
+
+                    # DOWN only scrolls once the cursor sits on the bottom row, so an unchanged
+                    # page just means the cursor moved. The end is when the cursor stops too
+                    # (or, if the highlight can't be found, the page stays put twice).
+                    if page_hashes == previous_page:
+                        stalled += 1
+                        if (selected is not None and selected == previous_selected) or stalled >= 2:
+                            break
+                    else:
+                        stalled = 0
+                    overlap = set(previous_page or [])
+                    previous_page = page_hashes
+                    previous_selected = selected
+
+                    for row_hash, row in rows:
+                        snapshot.rows_seen += 1
+                        if row_hash in overlap:
+                            continue  # Already read on the previous page
+
+                        if row_hash not in self.row_cache:
+                            self.row_cache[row_hash] = self._parse_row(self.vision.read_text(row))
+                            snapshot.rows_ocr += 1
+
+                        item = self.row_cache[row_hash]
+                        if item:
+                            snapshot.items.append(item)
+
+                    # Walk the cursor to the bottom row first; from there each press scrolls
+                    # one row, so a screenful less one row (kept as overlap) is a page
+                    bottom = len(rows) - 1
+                    if selected is not None and selected < bottom:
+                        presses = bottom - selected
+                    else:
+                        presses = bottom
+                    for _ in range(max(1, presses)):
+                        self.controller.press("DOWN", 0.02)
+                    time.sleep(self.settle_time)
+        finally:
+            if open_pipboy:
+                self.controller.press("TAB", 0.1)
+
+        snapshot.scan_seconds = time.time() - start
+        self.last_snapshot = snapshot
+        print(f"🎒 Inventory scan: {len(snapshot.items)} items, "
+              f"{snapshot.rows_ocr}/{snapshot.rows_seen} rows OCR'd in {snapshot.scan_seconds:.1f}s")
+        return snapshot
+
+    def _split_rows(self, gray: np.ndarray):
+        """Cut the list crop into row images keyed by a content hash"""
+
+        scale = gray.shape[0] / self.vision.ui_map["MENU_ELEMENTS"]["PIPBOY_LIST"][3]
+        row_height = max(8, int(round(self.BASE_ROW_HEIGHT * scale)))
+
+        rows = []
+        for top in range(0, gray.shape[0] - row_height + 1, row_height):
+            row = gray[top:top + row_height]
+            rows.append((self._row_hash(row), row))
+        return rows
+
+    @staticmethod
+    def _selected_row(rows) -> Optional[int]:
+        """Index of the highlighted (bright bar) row, or None if none is visible"""
+        brightness = [float(row.mean()) for _, row in rows]
+        if not brightness or max(brightness) <= 127:
+            return None
+        return int(np.argmax(brightness))
+
+    @staticmethod
+    def _row_hash(row: np.ndarray) -> str:
+        """Hash a row so the highlighted and normal versions match
+
+        The selected row is dark text on a HUD-colored bar, whose gray level
+        depends on the HUD color, so rows are binarized (Otsu) and flipped to
+        text-on-black before hashing rather than compared by brightness.
+        """
+        if int(row.max()) - int(row.min()) < 32:
+            return "blank"
+        _, binary = cv2.threshold(row, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        # Text is the minority; whichever polarity covers most of the row is background
+        if cv2.countNonZero(binary) > binary.size // 2:
+            binary = 255 - binary
+        small = cv2.resize(binary, (96, 8), interpolation=cv2.INTER_AREA)
+        # Re-threshold so anti-aliasing/bloom on glyph edges doesn't change the hash
+        return hashlib.blake2b(np.packbits(small > 127).tobytes(), digest_size=12).hexdigest()
+
+    def _parse_row(self, text: str) -> Optional[InventoryItem]:
+        text = text.strip()
+        if len(text) < 2:
+            return None
+
+        match = self._QUANTITY_PATTERN.match(text)
+        if match:
+            return InventoryItem(name=match.group(1), quantity=int(match.group(2)), raw_text=text)
+        return InventoryItem(name=text, raw_text=text)
+
+    def get_cache_stats(self) -> Dict:
+        return {
+            'cached_rows': len(self.row_cache),
+            'last_scan_items': len(self.last_snapshot.items) if self.last_snapshot else 0,
+            'last_scan_seconds': self.last_snapshot.scan_seconds if self.last_snapshot else 0.0
+        }
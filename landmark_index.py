@@ -0,0 +1,137 @@
+# landmark_index.py
+# "Where am I?" from perceptual hashes of stored views
+# Each view is reduced to a 64-bit DCT hash tagged with a location name and
+# kept in a multi-index hash table, so Hamming lookups only verify a few entries.
+
+import time
+import sqlite3
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import cv2
+from PIL import Image
+
+def perceptual_hash(img) -> int:
+    """64-bit pHash: sign of the low-frequency DCT block against its median"""
+    gray = np.array(img.convert("L")) if isinstance(img, Image.Image) else img
+    if gray.ndim == 3:
+        gray = cv2.cvtColor(gray, cv2.COLOR_RGB2GRAY)
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:8, :8].flatten()
+    bits = low > np.median(low[1:])  # DC term would skew the median
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+class MultiIndexHash:
+    """Multi-index hashing over 64-bit hashes: exact Hamming r-neighbour search
+
+    The hash is split into CHUNKS 16-bit substrings. By pigeonhole, any hash
+    within distance r of the query matches it in at least one substring to
+    within r // CHUNKS bits, so only those buckets' entries are verified.
+    """
+
+    CHUNKS = 4
+    CHUNK_BITS = 16
+
+    def __init__(self):
+        self.tables = [dict() for _ in range(self.CHUNKS)]
+        self.entries = []  # (hash, payload)
+        self._flip_masks = {}
+
+    @property
+    def size(self):
+        return len(self.entries)
+
+    def add(self, value: int, payload):
+        entry_id = len(self.entries)
+        self.entries.append((value, payload))
+        for chunk, table in enumerate(self.tables):
+            table.setdefault(self._chunk(value, chunk), []).append(entry_id)
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, object]]:
+        """All (distance, payload) within max_distance, nearest first"""
+        candidates = set()
+        for chunk, table in enumerate(self.tables):
+            key = self._chunk(value, chunk)
+            for mask in self._masks(max_distance // self.CHUNKS):
+                bucket = table.get(key ^ mask)
+                if bucket:
+                    candidates.update(bucket)
+
+        matches = []
+        for entry_id in candidates:
+            stored, payload = self.entries[entry_id]
+            distance = hamming(value, stored)
+            if distance <= max_distance:
+                matches.append((distance, payload))
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+    def _chunk(self, value: int, chunk: int) -> int:
+        return (value >> (chunk * self.CHUNK_BITS)) & ((1 << self.CHUNK_BITS) - 1)
+
+    def _masks(self, radius: int) -> List[int]:
+        """Every CHUNK_BITS-wide mask with at most `radius` bits set (cached)"""
+        if radius not in self._flip_masks:
+            self._flip_masks[radius] = [
+                mask for mask in range(1 << self.CHUNK_BITS) if bin(mask).count("1") <= radius
+            ]
+        return self._flip_masks[radius]
+
+class LandmarkIndex:
+    """Persistent perceptual-hash index of views tagged with location names"""
+
+    def __init__(self, db_path: str = "fo76_landmarks.db", match_distance: int = 10):
+        self.match_distance = match_distance
+        self.index = MultiIndexHash()
+        self.stats = {'lookups': 0, 'hits': 0, 'views_added': 0, 'last_lookup_ms': 0.0}
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS landmark_views (
+                phash TEXT,
+                location TEXT,
+                added REAL
+            )
+        ''')
+        self.conn.commit()
+
+        for phash, location in self.conn.execute("SELECT phash, location FROM landmark_views"):
+            self.index.add(int(phash, 16), location)
+        print(f"🗺️ Landmark index loaded: {self.index.size} views")
+
+    def add_view(self, img, location: str) -> bool:
+        """Store a view of a confirmed location (skips near-duplicates of the same place)"""
+        phash = perceptual_hash(img)
+        if any(name == location for _, name in self.index.search(phash, 4)):
+            return False
+
+        self.index.add(phash, location)
+        self.conn.execute("INSERT INTO landmark_views VALUES (?, ?, ?)", (f"{phash:016x}", location, time.time()))
+        self.conn.commit()
+        self.stats['views_added'] += 1
+        return True
+
+    def lookup(self, img) -> Optional[Tuple[str, int]]:
+        """Best (location, distance) for a view, or None if nothing is close enough"""
+        phash = perceptual_hash(img)
+        start = time.perf_counter()
+        matches = self.index.search(phash, self.match_distance)
+        self.stats['lookups'] += 1
+        self.stats['last_lookup_ms'] = (time.perf_counter() - start) * 1000
+
+        if not matches:
+            return None
+
+        # Vote among the closest views so one stray near-match doesn't win
+        best_distance = matches[0][0]
+        votes = Counter(name for distance, name in matches if distance <= best_distance + 2)
+        location = votes.most_common(1)[0][0]
+        self.stats['hits'] += 1
+        return location, best_distance
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'views': self.index.size}
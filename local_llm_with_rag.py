@@ -8,6 +8,7 @@ import re
 import time
 import random
 from typing import Optional, Dict, List
+from threat_scoring import scene_threat
 
 class LocalBrainWithRAG:
     """Enhanced LocalBrain that can access your existing RAG system"""
@@ -114,8 +115,8 @@ class LocalBrainWithRAG:
         detected_objects = vision_data.get('detected_objects', [])
         health = vision_data.get('health_percent', 100)
 
-        # Check for people/enemies
-        has_enemy = any('person' in obj.get('label', '').lower() for obj in detected_objects)
+        # Check for enemies (threat levels from the knowledge base)
+        has_enemy = scene_threat(vision_data)['hostile_count'] > 0
 
         if has_enemy and health < 30:
             return 'enemy_close_low_health'
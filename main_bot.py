@@ -8,9 +8,11 @@ import queue
 from collections import deque
 from vision_module import Vision
 from input_emulator import ActionController
+from input_macros import MacroLibrary
 from local_llm_module import LocalBrain
 from web_server_module import EnhancedWebServer
 from rag_module import LongTermMemory
+from preview_stream import PreviewPublisher
 from smart_goal_generator import SmartGoalGenerator
 import json
 
@@ -92,6 +94,7 @@ class IntelligentF76AI:
         # Initialize components
         self.vision = Vision()
         self.controller = ActionController()
+        self.macros = MacroLibrary()
         self.brain = LocalBrain()
         self.memory = LongTermMemory()
         self.goal_manager = F76GoalManager(self.memory)
@@ -99,8 +102,11 @@ class IntelligentF76AI:
         # Web server
         self.web_server = EnhancedWebServer(shared_state, command_queue)
         self.web_server.set_goal_manager(self.goal_manager, self.memory)
+        self.preview = PreviewPublisher()
+        self.web_server.set_preview(self.preview)
 
         # State
+        self.last_threat = None
         self.running = False
         self.paused = False
 
@@ -119,16 +125,21 @@ class IntelligentF76AI:
 
         add_log("🎮 Fallout 76 detected!", "success")
         self.vision.calibrate()
+        self.vision.scheduler.start()
         add_log("📐 Vision calibrated", "success")
 
     def get_current_context(self):
         """Get current situation context for AI decision making"""
         # Capture vision data
-        horizon_image = self.vision.capture_roi_image("HORIZON")
+        horizon_image = self.vision.scheduler.get_latest("HORIZON", max_age=1.0) or self.vision.capture_roi_image("HORIZON")
         detected_objects = []
+        self.last_threat = None
 
         if horizon_image:
             detected_objects = self.vision.analyze_image(horizon_image)
+            self.last_threat = self.vision.assess_threat(detected_objects, horizon_image, self.vision.detect_hostiles(horizon_image))
+            self.vision.scheduler.grow_for_detections("HORIZON", detected_objects, horizon_image.size)
+            self.preview.publish(horizon_image, detected_objects)
 
         # Get active goals
         active_goals = self.goal_manager.get_active_goals()
@@ -142,6 +153,9 @@ class IntelligentF76AI:
         else:
             context_parts.append("VISION: Clear area, no objects detected")
 
+        if self.last_threat and self.last_threat['hostile_count']:
+            context_parts.append(f"THREAT: {self.last_threat['hostile_count']} hostile(s), highest level {self.last_threat['max_level']}/4")
+
         if active_goals:
             goal_names = [self.goal_manager.goals[g]['name'] for g in active_goals]
             context_parts.append(f"ACTIVE GOALS: {', '.join(goal_names)}")
@@ -175,7 +189,7 @@ Be strategic and safe. Explain your reasoning."""
 
     def fallback_decision(self, context):
         """Simple fallback logic when AI brain fails"""
-        if "person" in context.lower() or "creature" in context.lower():
+        if self.last_threat and self.last_threat['hostile_count']:
             return {"action": "VATS", "duration": 0.1, "reason": "Detected potential threat"}
         elif "container" in context.lower() and "collect" in context.lower():
             return {"action": "INTERACT", "duration": 1.0, "reason": "Found lootable container"}
@@ -192,10 +206,10 @@ Be strategic and safe. Explain your reasoning."""
 
         # Execute the action
         if action == "M":
-            # Special handling for map
-            self.controller.press("M", duration=0.1)
-            time.sleep(2.0)  # Give time to read map
-            self.controller.press("M", duration=0.1)  # Close map
+            # Open, read, close: one timeline on the input scheduler
+            self.macros.play(self.controller, "CHECK_MAP").wait()
+        elif action in self.macros:
+            self.macros.play(self.controller, action).wait()
         elif action in ["FORWARD", "BACKWARD", "STRAFE_LEFT", "STRAFE_RIGHT", "JUMP", "INTERACT", "VATS", "ATTACK", "AIM", "WAIT"]:
             if action == "WAIT":
                 time.sleep(duration)
@@ -215,15 +229,25 @@ Be strategic and safe. Explain your reasoning."""
         cycle_count = 0
 
         while self.running:
+            # Input watchdog releases held keys if this loop stops coming round
+            self.controller.heartbeat()
+
             # Handle pause
             if self.paused:
                 time.sleep(1)
                 continue
 
-            # Check if game is still active
-            if not self.vision.is_game_active():
+            # Check if game is still active, and skip non-gameplay screens
+            game_mode = self.vision.detect_game_mode()
+            shared_state["game_mode"] = game_mode
+            if game_mode == "unknown":
                 add_log("⚠️ Game no longer detected, waiting...")
+                time.sleep(2)  # wait_for_game() returns at once if the window is up but the screen unreadable
                 self.wait_for_game()
+                continue
+            if game_mode != "gameplay":
+                time.sleep(0.5)
+                continue
 
             cycle_count += 1
             shared_state["cycle_count"] = cycle_count
@@ -3,6 +3,7 @@
 # Keeps YOUR existing smart AI system + adds goal management and hybrid thinking
 
 import asyncio
+import sys
 import time
 import json
 import sqlite3
@@ -13,9 +14,21 @@ from typing import Dict, List, Optional, Any
 # YOUR existing modules - don't break anything
 from vision_module import Vision
 from input_emulator import ActionController
+from gamepad_emulator import GamepadController
 from local_llm_module import LocalBrain  # Your KoboldCpp connection
 from web_server_module import EnhancedWebServer
 from rag_module import LongTermMemory
+from preview_stream import PreviewPublisher
+from inventory_scanner import PipBoyInventoryScanner
+from threat_scoring import scene_threat
+from landmark_index import LandmarkIndex
+from pose_estimator import PoseEstimator, VisualOdometry
+from vats_reader import VatsExecutor
+from fishing_loop import FishingLoop
+from detector_training import SessionRecorder
+from aim_controller import AimController
+from input_macros import MacroLibrary
+from heading_controller import HeadingController
 
 @dataclass
 class AIGoal:
@@ -43,11 +56,12 @@ class FastDecisionMaker:
     def __init__(self):
         # Instant survival reflexes
         self.survival_reflexes = {
-            'enemy_close_health_low': {'action': 'BACKWARD', 'duration': 3.0, 'reason': 'retreat_survival'},
-            'enemy_detected_healthy': {'action': 'VATS', 'duration': 0.1, 'reason': 'engage_enemy'},
-            'loot_safe_nearby': {'action': 'INTERACT', 'duration': 0.5, 'reason': 'collect_loot'},
-            'stuck_detected': {'action': 'BACKWARD', 'duration': 1.0, 'reason': 'unstuck_maneuver'},
-            'path_clear_exploring': {'action': 'FORWARD', 'duration': 2.0, 'reason': 'continue_exploration'}
+            # priority: higher preempts whatever lower-priority action is still in flight
+            'enemy_close_health_low': {'action': 'BACKWARD', 'duration': 3.0, 'reason': 'retreat_survival', 'priority': 3},
+            'enemy_detected_healthy': {'action': 'VATS', 'duration': 0.1, 'reason': 'engage_enemy', 'priority': 2},
+            'loot_safe_nearby': {'action': 'INTERACT', 'duration': 0.5, 'reason': 'collect_loot', 'priority': 1},
+            'stuck_detected': {'action': 'UNSTUCK', 'duration': 1.0, 'reason': 'unstuck_maneuver', 'priority': 1},
+            'path_clear_exploring': {'action': 'FORWARD', 'duration': 2.0, 'reason': 'continue_exploration', 'priority': 0}
         }
 
     def check_instant_response(self, game_state, active_goals):
@@ -57,7 +71,7 @@ class FastDecisionMaker:
         health = game_state.get('health', 100)
 
         # Enemy + low health = instant retreat
-        has_enemy = any('person' in obj.get('label', '').lower() for obj in detected_objects)
+        has_enemy = scene_threat(game_state)['hostile_count'] > 0
         if has_enemy and health < 30:
             return self.survival_reflexes['enemy_close_health_low']
 
@@ -153,12 +167,12 @@ class WorldDatabase:
         # Load from your existing RAG system
         self.rag_memory = LongTermMemory()
 
-    def learn_location(self, name: str, location_type: str = 'general'):
+    def learn_location(self, name: str, location_type: str = 'general', coordinates: tuple = (0, 0)):
         """Learn about a new location"""
         if name not in self.locations:
             location = WorldLocation(
                 name=name,
-                coordinates=(0, 0),  # Would get from vision
+                coordinates=coordinates,  # Dead-reckoned pose when first seen
                 location_type=location_type
             )
             self.locations[name] = location
@@ -180,12 +194,15 @@ class WorldDatabase:
 class IntelligentFallout76AI:
     """Complete AI system with fast/strategic hybrid thinking"""
 
-    def __init__(self):
+    def __init__(self, input_device=None, gamepad=False, record_sessions=False):
         print("🧠 Initializing Intelligent Fallout 76 AI System...")
 
         # YOUR existing modules - tested and working
         self.vision = Vision()
-        self.controller = ActionController()
+        # input_device: e.g. a RecordingDevice to run the decision-to-action path headless
+        # gamepad: analog sticks/triggers (Steam Deck native) instead of keyboard + mouse
+        controller_class = GamepadController if gamepad else ActionController
+        self.controller = controller_class(device=input_device)
         # Use a lightweight local model instead of Gemma 2B
         # Since we have OpenHermes for strategy, local model just needs to be fast
         self.brain = LocalBrain("qwen2:0.5b")  # Much lighter than Gemma 2B
@@ -195,6 +212,31 @@ class IntelligentFallout76AI:
         self.fast_decisions = FastDecisionMaker()
         self.goal_manager = GoalManager()
         self.world_db = WorldDatabase()
+        self.inventory_scanner = PipBoyInventoryScanner(self.vision, self.controller)
+        self.inventory_scan_interval = 300  # seconds between Pip-Boy scans
+        self.landmarks = LandmarkIndex()
+
+        # Dead-reckoned pose from our own inputs, corrected by landmark fixes
+        self.pose = PoseEstimator()
+        self.odometry = VisualOdometry()
+        self.controller.add_listener(self.pose.on_input_event)
+        # Holds a bearing (or follows the compass marker) while FORWARD is down
+        self.heading = HeadingController(self.vision, self.controller, pose=self.pose)
+        self.heading_tier = None    # decision tier that set the current heading target
+
+        # VATS engagements fire or cancel on the read hit chance
+        self.vats = VatsExecutor(self.vision, self.controller)
+        self.macros = MacroLibrary()
+        self.fishing = FishingLoop(self.vision, self.controller, macros=self.macros)
+        self.aim = AimController(self.vision, self.controller)
+
+        # In-flight input: the running action and at most one queued behind it
+        self.current_action = None
+        self.queued_action = None
+
+        # Auto-labeled frames for training a Fallout-specific detector
+        # record_sessions: start recording at once; it can also be toggled from /dataset/recording
+        self.session_recorder = SessionRecorder(enabled=record_sessions)
 
         # Performance tracking
         self.stats = {
@@ -205,7 +247,8 @@ class IntelligentFallout76AI:
             'local_decisions': 0,
             'locations_discovered': 0,
             'current_action': 'Idle',
-            'last_strategic_think': 0
+            'last_strategic_think': 0,
+            'last_inventory_scan': 0
         }
 
         # Enhanced web server integration
@@ -217,6 +260,10 @@ class IntelligentFallout76AI:
             'ai_started': False  # Key addition - AI waits for this
         }
         self.web_server = EnhancedWebServer(self.shared_state, None)
+        self.preview = PreviewPublisher()
+        self.web_server.set_preview(self.preview)
+        self.web_server.set_vision(self.vision)
+        self.web_server.set_session_recorder(self.session_recorder)
 
         print("✅ Intelligent AI system ready")
 
@@ -267,13 +314,13 @@ class IntelligentFallout76AI:
         if len(detected_objects) > 3:
             return True
 
-        # Multiple threats = complex
-        threats = [obj for obj in detected_objects if 'person' in obj.get('label', '').lower()]
-        if len(threats) > 1:
+        # Multiple or high-level threats = complex
+        threat = scene_threat(game_state)
+        if threat['hostile_count'] > 1 or threat['max_level'] >= 3:
             return True
 
         # Low health + enemies = complex
-        if game_state.get('health', 100) < 50 and threats:
+        if game_state.get('health', 100) < 50 and threat['hostile_count']:
             return True
 
         return False
@@ -304,7 +351,11 @@ Respond with JSON:
     "learning_note": "what this teaches"
 }}
 
-Available actions: FORWARD, BACKWARD, STRAFE_LEFT, STRAFE_RIGHT, INTERACT, VATS, ATTACK, JUMP, WAIT, SMOOTH_LOOK
+Available actions: FORWARD, BACKWARD, STRAFE_LEFT, STRAFE_RIGHT, INTERACT, VATS, ATTACK, JUMP, WAIT, SMOOTH_LOOK, FISH (cast and wait for a bite)
+FORWARD may add "bearing": degrees (0=N, 90=E) to walk a compass bearing, or "marker": true to follow the quest marker; steering is automatic, so use a long duration.
+Movement may add "speed": 0.1-1.0 (1.0 = run, 0.5 = walk quietly; gamepad only).
+Macros (use the name as the action; duration is fixed):
+{self.macros.describe()}
 """
 
         # Use YOUR existing brain that connects to KoboldCpp
@@ -354,7 +405,7 @@ Available actions: FORWARD, BACKWARD, STRAFE_LEFT, STRAFE_RIGHT, INTERACT, VATS,
 
         # If fishing goal and near water
         if 'fishing' in active_goals:
-            return {'action': 'INTERACT', 'duration': 2.0, 'reason': 'fishing_activity'}
+            return {'action': 'FISH', 'duration': 60.0, 'reason': 'fishing_activity'}
 
         # If objects detected, investigate
         if detected_objects:
@@ -397,28 +448,73 @@ Available actions: FORWARD, BACKWARD, STRAFE_LEFT, STRAFE_RIGHT, INTERACT, VATS,
         """Capture game state using YOUR vision system"""
 
         try:
-            if not self.vision.is_game_active():
-                return {'game_active': False}
+            game_mode = self.vision.detect_game_mode()
+            if game_mode == 'unknown':
+                return {'game_active': False, 'game_mode': game_mode}
+            if game_mode != 'gameplay':
+                # Loading screen, menu, map, Pip-Boy or death screen: nothing to detect or decide
+                return {'game_active': True, 'game_mode': game_mode}
 
-            # Use YOUR vision system
-            horizon_image = self.vision.capture_roi_image("HORIZON")
+            # Latest scheduled HORIZON capture; grab directly if the scheduler is behind
+            horizon_image = self.vision.scheduler.get_latest("HORIZON", max_age=1.0) or self.vision.capture_roi_image("HORIZON")
 
             game_state = {
                 'game_active': True,
+                'game_mode': game_mode,
                 'timestamp': time.time(),
                 'detected_objects': [],
                 'health': 100,  # Would parse from HUD
-                'location': 'unknown'  # Would determine from vision
+                'location': 'unknown',  # Would determine from vision
+                'inventory': []
             }
 
+            # Refresh the inventory snapshot occasionally; cached rows make rescans cheap
+            if 'manage_inventory' in self.goal_manager.get_active_goals():
+                if time.time() - self.stats['last_inventory_scan'] > self.inventory_scan_interval:
+                    await asyncio.to_thread(self.inventory_scanner.scan)
+                    self.stats['last_inventory_scan'] = time.time()
+
+            snapshot = self.inventory_scanner.last_snapshot
+            if snapshot:
+                game_state['inventory'] = snapshot.names()
+                game_state['inventory_actions'] = {
+                    name: self.world_db.should_keep_item(name) for name in snapshot.names()
+                }
+
             if horizon_image:
+                self.pose.on_flow(self.odometry.flow_magnitude(horizon_image))
+
                 detected_objects = self.vision.analyze_image(horizon_image)
                 game_state['detected_objects'] = detected_objects
+                game_state['hostiles'] = self.vision.detect_hostiles(horizon_image)
+                game_state['threat'] = self.vision.assess_threat(detected_objects, horizon_image, game_state['hostiles'])
+                self.vision.scheduler.grow_for_detections("HORIZON", detected_objects, horizon_image.size)
+                self.session_recorder.record(horizon_image, detected_objects, game_state['hostiles'],
+                                             complete=self.vision.last_analysis_full)
+                self.preview.publish(horizon_image, detected_objects)
 
                 # Learn about new locations
-                if detected_objects:
-                    # Could identify locations from landmarks
-                    pass
+                confirmed = self._read_location_banner()
+                if confirmed:
+                    self.landmarks.add_view(horizon_image, confirmed)
+                    game_state['location'] = confirmed
+                else:
+                    match = self.landmarks.lookup(horizon_image)
+                    if match:
+                        game_state['location'] = match[0]
+
+                location = game_state['location']
+                if location != 'unknown':
+                    if location in self.world_db.locations:
+                        # Recognized a known place: snap the dead-reckoned pose to it
+                        self.pose.apply_fix(self.world_db.locations[location].coordinates, confidence=0.5)
+                    else:
+                        self.world_db.learn_location(location, coordinates=self.pose.position)
+                        self.stats['locations_discovered'] += 1
+
+            pose = self.pose.update()
+            game_state['coordinates'] = pose['position']
+            game_state['heading'] = pose['heading']
 
             return game_state
 
@@ -426,24 +522,94 @@ Available actions: FORWARD, BACKWARD, STRAFE_LEFT, STRAFE_RIGHT, INTERACT, VATS,
             print(f"⚠️ Vision error: {e}")
             return {'game_active': False, 'error': str(e)}
 
+    def _read_location_banner(self) -> Optional[str]:
+        """OCR the location-discovered banner when it's on screen"""
+        return self.vision.read_location_banner(self.vision.scheduler.get_latest("LOCATION_BANNER", max_age=3.0))
+
     async def execute_action(self, decision):
         """Execute action using YOUR input controller"""
 
         action = decision.get('action', 'WAIT')
         duration = decision.get('duration', 1.0)
+        priority = decision.get('priority', 0)
+        decided_at = decision.get('decided_at', time.perf_counter())
+
+        # The queued action has started once the one ahead of it finished
+        if self.queued_action is not None and (self.current_action is None or self.current_action.finished):
+            self.current_action, self.queued_action = self.queued_action, None
+
+        # A new leg from a higher tier retargets the heading hold (before coalescing,
+        # since walking on usually just extends FORWARD). Turning by hand ends the leg,
+        # as does a plain FORWARD from the tier that set it; other tiers' FORWARDs keep walking it.
+        tier = decision.get('tier')
+        if 'bearing' in decision or 'marker' in decision:
+            self.heading.set_target(bearing=decision.get('bearing'), marker=bool(decision.get('marker')))
+            self.heading_tier = tier
+        elif self.heading.active and (action == 'SMOOTH_LOOK' or (action == 'FORWARD' and tier == self.heading_tier)):
+            self.heading.clear_target()
+
+        # Gamepad: movement is an analog left-stick setpoint whose deflection the tier picks
+        if action in ('FORWARD', 'BACKWARD', 'STRAFE_LEFT', 'STRAFE_RIGHT') and hasattr(self.controller, 'set_move_speed'):
+            self.controller.set_move_speed(action, decision.get('speed', 1.0))
+
+        # Same action still held: extend its deadline instead of a release/re-press stutter
+        current = self.current_action
+        if current is not None and not current.finished and current.action == action and action != 'SMOOTH_LOOK':
+            if self.controller.extend(current, duration, priority):
+                if self.queued_action is not None:
+                    self.queued_action.cancel()
+                    self.queued_action = None
+                return
+
+        # Higher priority cuts in now (held keys released); otherwise run after the current action
+        preempting = current is not None and not current.finished and priority > current.priority
+        if preempting:
+            self.controller.preempt(priority)
+            delay = 0.0
+        else:
+            delay = current.remaining if current is not None and not current.finished else 0.0
+        if self.queued_action is not None:
+            self.queued_action.cancel()  # A newer decision supersedes the one waiting in line
+            self.queued_action = None
 
         try:
+            handle = None
             if action == 'SMOOTH_LOOK':
                 dx = decision.get('dx', 45)
                 dy = decision.get('dy', 0)
-                self.controller.smooth_look(dx, dy, duration)
-            elif hasattr(self.controller, 'press') and action in ['FORWARD', 'BACKWARD', 'STRAFE_LEFT', 'STRAFE_RIGHT', 'INTERACT', 'VATS', 'ATTACK', 'JUMP']:
-                self.controller.press(action, duration)
+                # Non-blocking: the mouse steps run on the input timeline
+                handle = self.controller.schedule_look(dx, dy, duration, delay=delay, priority=priority)
+            elif action in ('VATS', 'ATTACK', 'FISH'):
+                # Closed-loop actions own the input while they run
+                if not preempting:
+                    self.controller.preempt(priority + 1)
+                if action == 'VATS':
+                    await asyncio.to_thread(self.vats.engage)
+                elif action == 'ATTACK':
+                    # Lock onto the nearest marked hostile before firing
+                    await asyncio.to_thread(self.aim.acquire)
+                    handle = self.controller.schedule(action, duration, priority=priority, decided_at=decided_at)
+                else:
+                    # Awaiting here suspends detection and the LLM until the bite loop ends
+                    result = await asyncio.to_thread(self.fishing.run, duration)
+                    print(f"🎣 Fishing: {result['result']}")
+            elif hasattr(self.controller, 'schedule') and action in ['FORWARD', 'BACKWARD', 'STRAFE_LEFT', 'STRAFE_RIGHT', 'INTERACT', 'JUMP']:
+                # Returns immediately; key-up fires on the input timeline while we keep perceiving
+                handle = self.controller.schedule(action, duration, delay=delay, priority=priority, decided_at=decided_at)
+            elif action in self.macros:
+                # Multi-step sequence compiled to one timeline; runs after the current action like any other
+                handle = self.macros.play(self.controller, action, delay=delay, priority=priority, decided_at=decided_at)
             elif action == 'WAIT':
                 await asyncio.sleep(duration)
             else:
                 print(f"⚠️ Unknown action: {action}")
 
+            if handle is not None:
+                if delay > 0:
+                    self.queued_action = handle
+                else:
+                    self.current_action = handle
+
         except Exception as e:
             print(f"❌ Action execution failed: {e}")
 
@@ -459,6 +625,8 @@ Available actions: FORWARD, BACKWARD, STRAFE_LEFT, STRAFE_RIGHT, INTERACT, VATS,
         while True:
             if self.vision.is_game_active():
                 self.vision.calibrate()
+                self.vision.scheduler.start()
+                self.heading.start()
                 print("✅ Game detected and calibrated")
                 break
             await asyncio.sleep(3)
@@ -466,6 +634,8 @@ Available actions: FORWARD, BACKWARD, STRAFE_LEFT, STRAFE_RIGHT, INTERACT, VATS,
         # Main intelligent loop
         print("🧠 Starting intelligent AI loop...")
         while True:
+            # Input watchdog releases held keys if this loop stops coming round
+            self.controller.heartbeat()
             try:
                 # Check for active goals
                 active_goals = self.goal_manager.get_active_goals()
@@ -480,14 +650,29 @@ Available actions: FORWARD, BACKWARD, STRAFE_LEFT, STRAFE_RIGHT, INTERACT, VATS,
                     await asyncio.sleep(2)
                     continue
 
+                self.shared_state['game_mode'] = game_state.get('game_mode', 'unknown')
+                if game_state['game_mode'] != 'gameplay':
+                    await asyncio.sleep(0.5)
+                    continue
+
                 # Make intelligent decision (multi-tier)
                 decision = await self.make_intelligent_decision(game_state)
+                decision['decided_at'] = time.perf_counter()
 
                 # Execute action
                 await self.execute_action(decision)
 
                 # Update stats
                 self.stats['decisions_made'] += 1
+                self.stats['detector'] = self.vision.detector_stats
+                self.stats['vats'] = self.vats.stats
+                self.stats['fishing'] = self.fishing.stats
+                self.stats['aim'] = self.aim.stats
+                self.stats['heading'] = self.heading.stats
+                self.stats['input'] = self.controller.preempt_stats
+                self.stats['motion'] = self.controller.motion_stats
+                self.stats['input_timing'] = self.controller.timing_stats()
+                self.stats['watchdog'] = self.controller.watchdog_stats
                 self.shared_state['stats'] = self.stats
 
                 # Brief pause
@@ -502,7 +687,9 @@ Available actions: FORWARD, BACKWARD, STRAFE_LEFT, STRAFE_RIGHT, INTERACT, VATS,
 
 if __name__ == "__main__":
     async def main():
-        ai = IntelligentFallout76AI()
+        # --record: save auto-labeled frames to datasets/fo76 from the start
+        # --gamepad: virtual Xbox pad (analog sticks) instead of keyboard + mouse
+        ai = IntelligentFallout76AI(gamepad="--gamepad" in sys.argv, record_sessions="--record" in sys.argv)
         await ai.start_intelligent_system()
 
     print("🧠 Starting Intelligent Fallout 76 AI...")
@@ -112,6 +112,13 @@ class IntegratedFallout76System:
                 'inventory': []
             }
 
+            # The view and any on-screen location banner let ComprehensiveAI recognize and learn places
+            game_state['view'] = horizon_image
+            confirmed = self.vision.read_location_banner(self.vision.capture_roi_image("LOCATION_BANNER"))
+            if confirmed:
+                game_state['location'] = confirmed
+                game_state['location_confirmed'] = True
+
             # Analyze horizon for objects
             if horizon_image:
                 detected_objects = self.vision.analyze_image(horizon_image)
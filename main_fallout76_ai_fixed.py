@@ -8,6 +8,7 @@ from collections import deque
 # Use YOUR existing modules
 from vision_module import Vision
 from input_emulator import ActionController
+from input_macros import MacroLibrary
 from local_llm_module import LocalBrain  # Your existing KoboldCpp connection
 from web_server_module import EnhancedWebServer
 from rag_module import LongTermMemory
@@ -21,6 +22,11 @@ class FixedFallout76AI:
         # Use YOUR existing modules - don't break anything
         self.vision = Vision()
         self.controller = ActionController()
+        self.macros = MacroLibrary()
+
+        # In-flight input: the running action and at most one queued behind it
+        self.current_action = None
+        self.queued_action = None
         self.brain = LocalBrain()  # Your KoboldCpp connection
         self.memory = LongTermMemory()
 
@@ -82,6 +88,8 @@ Make a decision. Respond with JSON:
 {{"action": "ACTION_NAME", "duration": 2.0, "reason": "brief explanation"}}
 
 Available actions: FORWARD, BACKWARD, STRAFE_LEFT, STRAFE_RIGHT, INTERACT, VATS, ATTACK, JUMP, WAIT, SMOOTH_LOOK
+Macros (use the name as the action):
+{self.macros.describe()}
 """
 
         # Use YOUR existing brain
@@ -118,15 +126,19 @@ Available actions: FORWARD, BACKWARD, STRAFE_LEFT, STRAFE_RIGHT, INTERACT, VATS,
         """Capture game state using YOUR vision system"""
 
         try:
-            # Use YOUR existing vision system
-            if not self.vision.is_game_active():
-                return {'game_active': False}
+            # Skip detection entirely outside of gameplay (loading, menus, map, Pip-Boy, death)
+            game_mode = self.vision.detect_game_mode()
+            if game_mode == 'unknown':
+                return {'game_active': False, 'game_mode': game_mode}
+            if game_mode != 'gameplay':
+                return {'game_active': True, 'game_mode': game_mode}
 
             # Capture horizon image
             horizon_image = self.vision.capture_roi_image("HORIZON")
 
             game_state = {
                 'game_active': True,
+                'game_mode': game_mode,
                 'detected_objects': [],
                 'health': 100,  # Would parse from UI
                 'timestamp': time.time()
@@ -151,19 +163,49 @@ Available actions: FORWARD, BACKWARD, STRAFE_LEFT, STRAFE_RIGHT, INTERACT, VATS,
 
         print(f"🎮 Action: {action} ({duration}s) - {reason}")
 
+        # The queued action has started once the one ahead of it finished
+        if self.queued_action is not None and (self.current_action is None or self.current_action.finished):
+            self.current_action, self.queued_action = self.queued_action, None
+
+        # Same action still held: extend its deadline instead of a release/re-press stutter
+        current = self.current_action
+        if current is not None and not current.finished and current.action == action and action != 'SMOOTH_LOOK':
+            if self.controller.extend(current, duration):
+                if self.queued_action is not None:
+                    self.queued_action.cancel()
+                    self.queued_action = None
+                return
+
+        # Otherwise run after the current action, never overlapping it
+        delay = current.remaining if current is not None and not current.finished else 0.0
+        if self.queued_action is not None:
+            self.queued_action.cancel()  # A newer decision supersedes the one waiting in line
+            self.queued_action = None
+
         try:
+            handle = None
             if action == 'SMOOTH_LOOK':
                 dx = decision.get('dx', 45)
                 dy = decision.get('dy', 0)
-                self.controller.smooth_look(dx, dy, duration)
+                # Non-blocking: the mouse steps run on the input timeline
+                handle = self.controller.schedule_look(dx, dy, duration, delay=delay)
             elif action in ['FORWARD', 'BACKWARD', 'STRAFE_LEFT', 'STRAFE_RIGHT',
                            'INTERACT', 'VATS', 'ATTACK', 'JUMP']:
-                self.controller.press(action, duration)
+                # Returns immediately; key-up fires on the input timeline while we keep perceiving
+                handle = self.controller.schedule(action, duration, delay=delay)
+            elif action in self.macros:
+                handle = self.macros.play(self.controller, action, delay=delay)
             elif action == 'WAIT':
                 await asyncio.sleep(duration)
             else:
                 print(f"⚠️ Unknown action: {action}")
 
+            if handle is not None:
+                if delay > 0:
+                    self.queued_action = handle
+                else:
+                    self.current_action = handle
+
         except Exception as e:
             print(f"❌ Action failed: {e}")
 
@@ -186,6 +228,8 @@ Available actions: FORWARD, BACKWARD, STRAFE_LEFT, STRAFE_RIGHT, INTERACT, VATS,
         # Main loop
         print("🎮 Starting game loop...")
         while True:
+            # Input watchdog releases held keys if this loop stops coming round
+            self.controller.heartbeat()
             try:
                 # Check if we have active goals
                 if not any(self.goals.values()):
@@ -201,6 +245,10 @@ Available actions: FORWARD, BACKWARD, STRAFE_LEFT, STRAFE_RIGHT, INTERACT, VATS,
                     await asyncio.sleep(3)
                     continue
 
+                if game_state['game_mode'] != 'gameplay':
+                    await asyncio.sleep(0.5)
+                    continue
+
                 # Make decision
                 decision = await self.make_decision(game_state)
 
@@ -0,0 +1,138 @@
+# pose_estimator.py
+# Dead-reckoning 2D pose from our own inputs plus visual odometry
+# Integrates held movement keys and REL_X mouse motion from ActionController,
+# scales speed by optical-flow evidence, and snaps back on landmark/map fixes.
+
+import math
+import time
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import cv2
+
+# Key -> direction relative to the current heading (degrees)
+MOVE_DIRECTIONS = {
+    "FORWARD": 0.0,
+    "BACKWARD": 180.0,
+    "STRAFE_LEFT": -90.0,
+    "STRAFE_RIGHT": 90.0,
+}
+
+class VisualOdometry:
+    """Median optical-flow magnitude between consecutive downsampled frames"""
+
+    SIZE = (160, 40)  # HORIZON strip at 1/12 scale
+
+    def __init__(self):
+        self.prev_gray = None
+
+    def flow_magnitude(self, img) -> Optional[float]:
+        gray = cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2GRAY)
+        gray = cv2.resize(gray, self.SIZE, interpolation=cv2.INTER_AREA)
+        prev, self.prev_gray = self.prev_gray, gray
+        if prev is None:
+            return None
+
+        flow = cv2.calcOpticalFlowFarneback(prev, gray, None, 0.5, 2, 9, 2, 5, 1.1, 0)
+        return float(np.median(np.hypot(flow[..., 0], flow[..., 1])))
+
+class PoseEstimator:
+    """Position (game units) and heading (degrees, 0 = north, clockwise) estimate"""
+
+    def __init__(self, walk_speed: float = 3.5, sprint_multiplier: float = 1.6,
+                 degrees_per_pixel: float = 0.12, expected_flow: float = 1.5):
+        self.walk_speed = walk_speed
+        self.sprint_multiplier = sprint_multiplier
+        self.degrees_per_pixel = degrees_per_pixel
+        self.expected_flow = expected_flow  # flow px/frame at walking speed, used to detect being blocked
+
+        self.x = 0.0
+        self.y = 0.0
+        self.heading = 0.0
+        self.uncertainty = 0.0      # grows with distance travelled since the last fix
+        self.speed_scale = 1.0      # optical-flow evidence that we're really moving
+
+        self.held = set()
+        self.last_update = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stats = {'fixes': 0, 'distance': 0.0, 'last_fix_error': 0.0}
+
+    @property
+    def position(self) -> Tuple[float, float]:
+        return (round(self.x, 1), round(self.y, 1))
+
+    def on_input_event(self, event: str, action: str, value):
+        """ActionController listener: ('down'|'up', action, None) or ('look', 'REL_X', dx)"""
+        with self._lock:
+            self._integrate(time.perf_counter())
+            if event == "down":
+                self.held.add(action)
+            elif event == "up":
+                self.held.discard(action)
+            elif event == "look" and action == "REL_X":
+                self.heading = (self.heading + value * self.degrees_per_pixel) % 360
+
+    def on_compass(self, heading: float, weight: float = 0.5):
+        """Blend an absolute compass heading into the mouse-integrated one"""
+        with self._lock:
+            error = (heading - self.heading + 180) % 360 - 180
+            self.heading = (self.heading + weight * error) % 360
+
+    def on_flow(self, magnitude: Optional[float]):
+        """Scale dead-reckoned speed by how much the view actually moved"""
+        if magnitude is None:
+            return
+        with self._lock:
+            if any(action in MOVE_DIRECTIONS for action in self.held):
+                observed = min(1.5, magnitude / self.expected_flow)
+                self.speed_scale = 0.7 * self.speed_scale + 0.3 * observed
+
+    def apply_fix(self, coordinates: Tuple[float, float], confidence: float = 1.0):
+        """Correct toward a known position (landmark match or map read)"""
+        with self._lock:
+            self._integrate(time.perf_counter())
+            fx, fy = coordinates
+            self.stats['last_fix_error'] = math.hypot(fx - self.x, fy - self.y)
+            self.x += confidence * (fx - self.x)
+            self.y += confidence * (fy - self.y)
+            self.uncertainty *= (1.0 - confidence)
+            self.stats['fixes'] += 1
+
+    def update(self) -> Dict:
+        """Advance to now and return the current estimate (cheap enough for every frame)"""
+        with self._lock:
+            self._integrate(time.perf_counter())
+            return {
+                'position': self.position,
+                'heading': round(self.heading, 1),
+                'uncertainty': round(self.uncertainty, 1)
+            }
+
+    def _integrate(self, now: float):
+        dt = now - self.last_update
+        self.last_update = now
+        if dt <= 0 or not self.held:
+            return
+
+        speed = self.walk_speed * self.speed_scale
+        if "SPRINT" in self.held:
+            speed *= self.sprint_multiplier
+
+        dx = dy = 0.0
+        for action in self.held:
+            offset = MOVE_DIRECTIONS.get(action)
+            if offset is None:
+                continue
+            angle = math.radians(self.heading + offset)
+            dx += math.sin(angle)
+            dy += math.cos(angle)
+
+        norm = math.hypot(dx, dy)
+        if norm == 0:
+            return
+        step = speed * dt
+        self.x += step * dx / norm
+        self.y += step * dy / norm
+        self.uncertainty += 0.1 * step
+        self.stats['distance'] += step
@@ -6,6 +6,7 @@ import json
 import time
 from collections import defaultdict
 from typing import Dict, List, Optional
+from threat_scoring import scene_threat
 
 class FastRAGSystem:
     """Pre-processes knowledge for instant small-brain lookups"""
@@ -62,7 +63,7 @@ class FastRAGSystem:
         # Goal-specific procedures (for small brain)
         self.goal_procedures = {
             'fishing': {
-                'at_water': {'action': 'INTERACT', 'duration': 5.0, 'reason': 'cast_fishing_line'},
+                'at_water': {'action': 'FISH', 'duration': 60.0, 'reason': 'cast_fishing_line'},
                 'no_water': {'action': 'FORWARD', 'duration': 3.0, 'reason': 'find_water_body'},
                 'has_fish': {'action': 'INTERACT', 'duration': 1.0, 'reason': 'collect_catch'}
             },
@@ -165,7 +166,7 @@ class SmartDecisionRouter:
         health = situation.get('health', 100)
 
         # Threat detection
-        has_enemy = any('person' in obj.get('label', '').lower() for obj in detected_objects)
+        has_enemy = scene_threat(situation)['hostile_count'] > 0
         if has_enemy:
             if health < 30:
                 return 'low_health_combat'
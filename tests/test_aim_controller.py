@@ -0,0 +1,32 @@
+# tests/test_aim_controller.py
+# Replay-based convergence checks for the aim loop (no screen or input device needed)
+
+import pytest
+
+from aim_controller import AimController, convergence_time, replay
+
+class _Vision:
+    game_window = {"width": 1920}
+
+# Target errors as replay() takes them: initial offset (px at 1080p), then the
+# target's own motion per frame with the applied corrections removed
+STATIC_TRACE = [(300.0, -80.0)] + [(0.0, 0.0)] * 90
+STRAFING_TRACE = [(300.0, -80.0)] + [(4.0 + (0.5 if frame % 2 else -0.5), 0.0) for frame in range(90)]
+
+MAX_CONVERGENCE_S = 0.5
+
+@pytest.mark.parametrize("latency_frames, gain", [(0, 0.5), (1, 0.4)])
+@pytest.mark.parametrize("errors", [STATIC_TRACE, STRAFING_TRACE], ids=["static", "strafing"])
+def test_replay_converges_within_bound(errors, latency_frames, gain):
+    aim = AimController(_Vision(), None, gain=gain, latency_frames=latency_frames)
+    _, deadband = aim.scale(1920)
+
+    settle = convergence_time(replay(aim, errors), deadband)
+
+    assert settle is not None, "aim never settled inside the deadband"
+    assert settle <= MAX_CONVERGENCE_S
+
+def test_steps_are_clamped():
+    aim = AimController(_Vision(), None, gain=0.5)
+    trace = replay(aim, [(900.0, 400.0)] + [(0.0, 0.0)] * 30)
+    assert all(abs(dx) <= aim.max_step and abs(dy) <= aim.max_step for _, _, _, dx, dy in trace)
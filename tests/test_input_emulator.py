@@ -0,0 +1,58 @@
+# tests/test_input_emulator.py
+# Motion and timing checks against the recording backend (no /dev/uinput needed)
+
+import time
+
+import pytest
+
+from input_emulator import EASING, ActionController, RecordingDevice, plan_motion, sleep_until
+
+FRAME = 1 / 60      # s: input timing only has to be right to within a game frame
+
+@pytest.fixture
+def recorded():
+    device = RecordingDevice()
+    controller = ActionController(device=device)
+    yield controller, device
+    controller.close()
+
+@pytest.mark.parametrize("easing", sorted(EASING))
+@pytest.mark.parametrize("dx, dy, duration", [(123, -37, 0.2), (1, 0, 0.1), (-500, 250, 0.05), (7, 3, 1.0)])
+def test_plan_motion_sums_to_requested_delta(dx, dy, duration, easing):
+    plan = plan_motion(dx, dy, duration, easing)
+    assert (sum(step[1] for step in plan), sum(step[2] for step in plan)) == (dx, dy)
+    assert all(0 <= offset < duration for offset, _, _ in plan)
+
+def test_smooth_look_rel_totals_match_request(recorded):
+    controller, device = recorded
+    controller.smooth_look(123, -37, 0.1)
+    assert device.rel_totals() == (123, -37)
+
+def test_scheduled_look_rel_totals_match_request(recorded):
+    controller, device = recorded
+    controller.schedule_look(-80, 45, 0.1).wait()
+    assert device.rel_totals() == (-80, 45)
+
+def test_press_hold_error_within_a_frame(recorded):
+    controller, device = recorded
+    controller.press("JUMP", 0.05)
+    (down, up), = device.holds("JUMP")
+    assert abs((up - down) - 0.05) < FRAME
+
+def test_scheduled_hold_error_within_a_frame(recorded):
+    controller, device = recorded
+    for _ in range(10):
+        controller.schedule("FORWARD", 0.03).wait()
+    holds = device.holds("FORWARD")
+    assert len(holds) == 10
+    assert all(up is not None and abs((up - down) - 0.03) < FRAME for down, up in holds)
+
+def test_sleep_until_never_early_and_within_a_frame():
+    lateness = []
+    for delay in (0.001, 0.005, 0.01, 0.02, 0.03) * 4:
+        deadline = time.perf_counter() + delay
+        sleep_until(deadline)
+        lateness.append(time.perf_counter() - deadline)
+    assert min(lateness) >= 0
+    # One OS preemption on a loaded box can blow a single sample; the typical one can't
+    assert sorted(lateness)[len(lateness) // 2] < FRAME
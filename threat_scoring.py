@@ -0,0 +1,169 @@
+# threat_scoring.py
+# Threat classification from knowledge/01_core_logic.txt (Rules 1.2.1 / 1.2.2)
+# Detector class ids map through a precomputed label -> threat-level table,
+# then level, size and screen position combine into one scene score per frame.
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Rule 1.2.1 threat categories, keyed by detector label
+THREAT_LEVELS = {
+    # Level 0 - non-threat
+    'radstag': 0, 'brahmin': 0, 'cow': 0, 'horse': 0, 'sheep': 0, 'friendly robot': 0,
+    # Level 1 - low
+    'radroach': 1, 'liberator': 1, 'ghoul': 1, 'cat': 1, 'bird': 1,
+    # Level 2 - medium
+    'scorched': 2, 'super mutant': 2, 'mole miner': 2, 'bloatfly': 2, 'bloodbug': 2,
+    'feral ghoul': 2, 'mongrel': 2, 'dog': 2,
+    # Level 3 - high
+    'deathclaw': 3, 'yao guai': 3, 'bear': 3, 'wendigo': 3, 'snallygaster': 3,
+    'grafton monster': 3, 'assaultron': 3, 'major gutsy': 3, 'scorchbeast': 3,
+    # Level 4 - special / player
+    'person': 4, 'player': 4,
+    # Distilled detector classes (detector_training.DETECTOR_CLASSES). A health bar
+    # only marks a hostile that has its own box, so it must not count a second time.
+    'hostile': 2, 'creature': 2, 'health_bar': 0,
+}
+
+# Rule 1.2.2: any creature we can't name is assumed to be high threat
+UNKNOWN_CREATURE_LEVEL = 3
+
+# COCO classes that are scenery/objects rather than creatures
+OBJECT_LABELS = {
+    'bicycle', 'car', 'motorcycle', 'airplane', 'bus', 'train', 'truck', 'boat', 'traffic light',
+    'fire hydrant', 'stop sign', 'parking meter', 'bench', 'backpack', 'umbrella', 'handbag', 'tie',
+    'suitcase', 'frisbee', 'skis', 'snowboard', 'sports ball', 'kite', 'baseball bat',
+    'baseball glove', 'skateboard', 'surfboard', 'tennis racket', 'bottle', 'wine glass', 'cup',
+    'fork', 'knife', 'spoon', 'bowl', 'banana', 'apple', 'sandwich', 'orange', 'broccoli', 'carrot',
+    'hot dog', 'pizza', 'donut', 'cake', 'chair', 'couch', 'potted plant', 'bed', 'dining table',
+    'toilet', 'tv', 'laptop', 'mouse', 'remote', 'keyboard', 'cell phone', 'microwave', 'oven',
+    'toaster', 'sink', 'refrigerator', 'book', 'clock', 'vase', 'scissors', 'teddy bear',
+    'hair drier', 'toothbrush', 'container',
+}
+
+# Contribution of one detection at each level before size/position weighting
+LEVEL_WEIGHTS = np.array([0.0, 0.25, 0.5, 1.0, 0.75], dtype=np.float32)
+
+# Fallbacks for detections that only carry Vision's text descriptions
+_SIZE_FRACTIONS = {'very large (close)': 0.5, 'large (medium distance)': 0.3, 'small (far away)': 0.1}
+_POSITION_FRACTIONS = {'on the left': 0.17, 'in the center': 0.5, 'on the right': 0.83}
+
+def threat_level_for_label(label: str) -> int:
+    """Rule 1.2.1 level for a detector label, Rule 1.2.2 for unknown creatures"""
+    label = label.lower().strip()
+    if label in THREAT_LEVELS:
+        return THREAT_LEVELS[label]
+    if label in OBJECT_LABELS:
+        return 0
+    return UNKNOWN_CREATURE_LEVEL
+
+class ThreatScorer:
+    """Vectorized scene threat scoring over one frame's detections"""
+
+    def __init__(self):
+        self.class_names = None
+        self.level_table = np.zeros(0, dtype=np.int8)
+
+    def bind_model(self, class_names: Dict[int, str]):
+        """Precompute the class id -> threat level table for a detector's label set"""
+        if class_names is self.class_names:
+            return
+        size = max(class_names.keys()) + 1 if class_names else 0
+        table = np.full(size, UNKNOWN_CREATURE_LEVEL, dtype=np.int8)
+        for class_id, label in class_names.items():
+            table[class_id] = threat_level_for_label(label)
+        self.class_names = class_names
+        self.level_table = table
+
+    def score(self, class_ids: np.ndarray, boxes: np.ndarray, frame_width: float) -> Dict:
+        """Score N detections given class ids (N,) and xyxy boxes (N, 4) in one pass"""
+        levels = self.level_table[class_ids] if len(class_ids) else np.zeros(0, dtype=np.int8)
+        return self._combine(levels, boxes, frame_width)
+
+    def score_detections(self, detections: List[Dict], frame_size: Optional[tuple] = None) -> Dict:
+        """Score Vision-style detection dicts (uses class ids when available)"""
+
+        if not detections:
+            return self._combine(np.zeros(0, dtype=np.int8), np.zeros((0, 4), dtype=np.float32), 1.0)
+
+        if frame_size and all('box' in det for det in detections):
+            boxes = np.array([det['box'] for det in detections], dtype=np.float32)
+            frame_width = float(frame_size[0])
+        else:
+            # Rebuild normalized pseudo-boxes from the text descriptions
+            frame_width = 1.0
+            centers = np.array([_POSITION_FRACTIONS.get(det.get('position'), 0.5) for det in detections], dtype=np.float32)
+            widths = np.array([_SIZE_FRACTIONS.get(det.get('size'), 0.1) for det in detections], dtype=np.float32)
+            boxes = np.stack([centers - widths / 2, np.zeros_like(centers), centers + widths / 2, np.ones_like(centers)], axis=1)
+
+        if self.class_names is not None and all('class_id' in det for det in detections):
+            levels = self.level_table[np.array([det['class_id'] for det in detections], dtype=np.intp)]
+        else:
+            levels = np.array([threat_level_for_label(det.get('label', '')) for det in detections], dtype=np.int8)
+
+        return self._combine(levels, boxes, frame_width)
+
+    def _combine(self, levels: np.ndarray, boxes: np.ndarray, frame_width: float) -> Dict:
+        if len(levels) == 0:
+            return {'score': 0.0, 'max_level': 0, 'hostile_count': 0, 'primary_bearing': None, 'levels': [], 'scores': []}
+
+        widths = np.clip((boxes[:, 2] - boxes[:, 0]) / frame_width, 0.0, 1.0)
+        centers = (boxes[:, 0] + boxes[:, 2]) / (2 * frame_width)
+        centrality = 1.0 - np.clip(np.abs(centers - 0.5) * 2, 0.0, 1.0)
+
+        # Bigger (closer) and more central threats weigh more
+        per_detection = LEVEL_WEIGHTS[levels] * (0.5 + widths) * (0.5 + 0.5 * centrality)
+        primary = int(np.argmax(per_detection))
+
+        return {
+            'score': float(per_detection.sum()),
+            'max_level': int(levels.max()),
+            'hostile_count': int(np.count_nonzero(levels >= 1)),
+            # -1 (far left) .. +1 (far right) for the most significant threat
+            'primary_bearing': float(centers[primary] * 2 - 1) if per_detection[primary] > 0 else None,
+            'levels': levels.tolist(),
+            'scores': per_detection.tolist()
+        }
+
+    def merge_markers(self, threat: Dict, markers: Dict, horizontal_fov: float = 90.0) -> Dict:
+        """Make the game's hostile markers the primary signal, with YOLO as secondary
+
+        Marked hostiles count as level 2 (level 3 if legendary). YOLO creatures
+        still count, but a YOLO 'person' with no marker is treated as a player,
+        not a hostile.
+        """
+        levels = np.array(threat['levels'], dtype=np.int8)
+        creature_levels = levels[(levels >= 1) & (levels <= 3)]
+        marker_levels = np.array([3 if hostile['legendary'] else 2 for hostile in markers['hostiles']], dtype=np.int8)
+        bearings = np.array([hostile['bearing'] for hostile in markers['hostiles']], dtype=np.float32) / (horizontal_fov / 2)
+
+        centrality = 1.0 - np.clip(np.abs(bearings), 0.0, 1.0)
+        marker_scores = LEVEL_WEIGHTS[marker_levels] * 0.55 * (0.5 + 0.5 * centrality)
+
+        # Unmarked persons are players: drop their weight along with their count
+        detection_scores = np.array(threat.get('scores', []), dtype=np.float32)
+        yolo_score = detection_scores[levels != 4].sum() if len(detection_scores) == len(levels) else threat['score']
+
+        merged = dict(threat)
+        merged.update({
+            'score': float(yolo_score + marker_scores.sum()),
+            'max_level': int(max(marker_levels.max(initial=0), creature_levels.max(initial=0))),
+            'hostile_count': int(max(len(marker_levels), len(creature_levels))),
+            'player_count': int(np.count_nonzero(levels == 4)),
+            'legendary_count': markers['legendary_count'],
+            'source': 'markers'
+        })
+        if len(marker_levels):
+            merged['primary_bearing'] = float(np.clip(bearings[int(np.argmax(marker_scores))], -1.0, 1.0))
+        return merged
+
+# Shared scorer; Vision binds it to the loaded detector's class names
+THREAT_SCORER = ThreatScorer()
+
+def scene_threat(state: Dict) -> Dict:
+    """Threat summary for a game state, computing it if Vision didn't attach one"""
+    threat = state.get('threat')
+    if threat is None:
+        threat = THREAT_SCORER.score_detections(state.get('detected_objects', []))
+    return threat
@@ -0,0 +1,204 @@
+# vats_reader.py
+# VATS overlay reader for hit-chance-driven firing
+# Detects the VATS overlay and reads per-target hit-chance percentages with
+# cached digit templates, so the executor can fire or cancel within a frame
+# or two instead of pressing VATS blind and sleeping.
+
+import os
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+import cv2
+import mss
+
+GLYPH_SIZE = (12, 18)  # (w, h) every glyph is normalized to before matching
+
+class DigitTemplates:
+    """Binary glyph templates for 0-9 and '%', loaded once and cached"""
+
+    SYMBOLS = "0123456789%"
+
+    def __init__(self, template_dir: str = "templates/vats_digits"):
+        self.template_dir = template_dir
+        self.templates = {}
+        for symbol in self.SYMBOLS:
+            self.templates[symbol] = self._load(symbol) if self._exists(symbol) else self._render(symbol)
+        self._stack = np.stack([self.templates[symbol] for symbol in self.SYMBOLS]).astype(np.float32)
+        self._stack = self._normalize(self._stack.reshape(len(self.SYMBOLS), -1))
+
+    def classify(self, glyph: np.ndarray) -> Tuple[str, float]:
+        """Best-matching symbol and its correlation for a binary glyph crop"""
+        sample = cv2.resize(glyph, GLYPH_SIZE, interpolation=cv2.INTER_AREA).astype(np.float32)
+        scores = self._stack @ self._normalize(sample.reshape(1, -1))[0]
+        best = int(np.argmax(scores))
+        return self.SYMBOLS[best], float(scores[best])
+
+    def learn(self, symbol: str, glyph: np.ndarray):
+        """Replace a template with a real in-game capture (persisted for next run)"""
+        os.makedirs(self.template_dir, exist_ok=True)
+        template = cv2.resize(glyph, GLYPH_SIZE, interpolation=cv2.INTER_AREA)
+        cv2.imwrite(self._path(symbol), template)
+        self.__init__(self.template_dir)
+
+    @staticmethod
+    def _normalize(rows: np.ndarray) -> np.ndarray:
+        rows = rows - rows.mean(axis=1, keepdims=True)
+        return rows / (np.linalg.norm(rows, axis=1, keepdims=True) + 1e-6)
+
+    def _path(self, symbol: str) -> str:
+        name = "percent" if symbol == "%" else symbol
+        return os.path.join(self.template_dir, f"{name}.png")
+
+    def _exists(self, symbol: str) -> bool:
+        return os.path.exists(self._path(symbol))
+
+    def _load(self, symbol: str) -> np.ndarray:
+        return cv2.resize(cv2.imread(self._path(symbol), cv2.IMREAD_GRAYSCALE), GLYPH_SIZE)
+
+    @staticmethod
+    def _render(symbol: str) -> np.ndarray:
+        """Fallback template drawn with a Hershey font until real captures are learned"""
+        canvas = np.zeros((40, 40), np.uint8)
+        cv2.putText(canvas, symbol, (4, 32), cv2.FONT_HERSHEY_DUPLEX, 1.0, 255, 2)
+        ys, xs = np.nonzero(canvas)
+        glyph = canvas[ys.min():ys.max() + 1, xs.min():xs.max() + 1]
+        return cv2.resize(glyph, GLYPH_SIZE, interpolation=cv2.INTER_AREA)
+
+class VatsReader:
+    """Detects the VATS overlay and reads the hit chance shown for each target"""
+
+    MIN_MATCH = 0.55
+    OVERLAY_FRACTION = 0.03     # HUD-colored share of HORIZON while VATS highlights targets
+
+    def __init__(self, hud_range=([20, 100, 100], [40, 255, 255]), horizontal_fov: float = 90.0):
+        self.hud_lower, self.hud_upper = np.array(hud_range[0]), np.array(hud_range[1])
+        self.horizontal_fov = horizontal_fov
+        self.templates = DigitTemplates()
+        self.last_ms = 0.0
+
+    def read(self, img) -> Dict:
+        """{'active': bool, 'targets': [{'chance', 'box', 'bearing'}]} for one HORIZON frame"""
+        start = time.perf_counter()
+        rgb = np.asarray(img)
+        hsv = cv2.cvtColor(rgb, cv2.COLOR_RGB2HSV)
+        mask = cv2.inRange(hsv, self.hud_lower, self.hud_upper)
+
+        active = cv2.countNonZero(mask) / mask.size >= self.OVERLAY_FRACTION
+        targets = self._read_percentages(mask, rgb.shape[1]) if active else []
+
+        self.last_ms = (time.perf_counter() - start) * 1000
+        return {'active': active, 'targets': targets, 'read_ms': round(self.last_ms, 2)}
+
+    def _read_percentages(self, mask: np.ndarray, width: int) -> List[Dict]:
+        try:
+            # 16-bit labels are ~3x faster; only pure noise overflows them, and that isn't text
+            count, _, stats, _ = cv2.connectedComponentsWithStatsWithAlgorithm(mask, 8, cv2.CV_16U, cv2.CCL_BOLELLI)
+        except cv2.error:
+            return []
+        scale = mask.shape[0] / 480.0
+        parts = sorted(
+            (list(stats[i][:4]) for i in range(1, count)
+             if stats[i][3] <= 30 * scale and stats[i][2] <= 30 * scale),
+            key=lambda part: part[0]
+        )
+
+        # '%' (and broken strokes) come apart into several blobs; merge x-overlapping ones
+        glyphs = []
+        for x, y, w, h in parts:
+            if glyphs:
+                gx, gy, gw, gh = glyphs[-1]
+                if x < gx + gw and y < gy + gh + 4 * scale and gy < y + h + 4 * scale:
+                    x2, y2 = max(gx + gw, x + w), max(gy + gh, y + h)
+                    gx, gy = min(gx, x), min(gy, y)
+                    glyphs[-1] = [gx, gy, x2 - gx, y2 - gy]
+                    continue
+            glyphs.append([x, y, w, h])
+        glyphs = [glyph for glyph in glyphs if 8 * scale <= glyph[3] <= 30 * scale]
+
+        # Chain left-to-right neighbours that share a text line into runs
+        runs = []
+        for glyph in glyphs:
+            x, y, w, h = glyph
+            for run in runs:
+                px, py, pw, ph = run[-1]
+                if 0 <= x - (px + pw) < ph * 0.6 and y < py + ph and py < y + h:
+                    run.append(glyph)
+                    break
+            else:
+                runs.append([glyph])
+
+        targets = []
+        for run in runs:
+            text = ""
+            for x, y, w, h in run:
+                symbol, score = self.templates.classify(mask[y:y + h, x:x + w])
+                if score < self.MIN_MATCH:
+                    text = ""
+                    break
+                text += symbol
+
+            if not text.endswith("%") or not text[:-1].isdigit() or len(text) > 4:
+                continue
+            chance = int(text[:-1])
+            if chance > 100:
+                continue
+
+            x1, y1 = run[0][0], min(g[1] for g in run)
+            x2, y2 = run[-1][0] + run[-1][2], max(g[1] + g[3] for g in run)
+            targets.append({
+                'chance': chance,
+                'box': [int(x1), int(y1), int(x2), int(y2)],
+                'bearing': round(float((x1 + x2) / 2 / width - 0.5) * self.horizontal_fov, 1)
+            })
+        return targets
+
+class VatsExecutor:
+    """Enter VATS, read the hit chance, and fire or cancel within a couple of frames"""
+
+    def __init__(self, vision, controller, min_chance: int = 60, max_frames: int = 6, shots: int = 3):
+        self.vision = vision
+        self.controller = controller
+        self.reader = VatsReader(vision.hud_color_ranges["green_amber"])
+        self.min_chance = min_chance
+        self.max_frames = max_frames
+        self.shots = shots
+        self.stats = {'engagements': 0, 'fired': 0, 'cancelled': 0, 'no_overlay': 0, 'last_decision_ms': 0.0}
+
+    def engage(self) -> Dict:
+        """Blocking VATS engagement; run off the event loop (asyncio.to_thread)"""
+        self.stats['engagements'] += 1
+        self.controller.press("VATS", 0.05)
+        entered = time.perf_counter()
+
+        reading = None
+        # Our own mss handle: this runs on a worker thread and Vision's belongs to the main one
+        with mss.mss() as sct:
+            for _ in range(self.max_frames):
+                frame = self.vision.capture_roi_image("HORIZON", sct=sct)
+                if frame is None:
+                    break
+                reading = self.reader.read(frame)
+                if reading['active'] and reading['targets']:
+                    break
+                time.sleep(0.016)
+
+        self.stats['last_decision_ms'] = (time.perf_counter() - entered) * 1000
+
+        if not reading or not reading['active']:
+            self.stats['no_overlay'] += 1
+            return {'result': 'no_overlay'}
+
+        best = max((target['chance'] for target in reading['targets']), default=0)
+        if best >= self.min_chance:
+            for _ in range(self.shots):
+                self.controller.press("ATTACK", 0.05)
+            self.stats['fired'] += 1
+            print(f"🎯 VATS fire at {best}% ({self.stats['last_decision_ms']:.0f}ms to decide)")
+            return {'result': 'fired', 'chance': best}
+
+        # Too risky (Rule 1.3.2: don't burn AP needed for escape) - leave VATS
+        self.controller.press("VATS", 0.05)
+        self.stats['cancelled'] += 1
+        print(f"🎯 VATS cancelled - best hit chance {best}%")
+        return {'result': 'cancelled', 'chance': best}
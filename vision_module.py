@@ -1,25 +1,510 @@
 # vision_module.py
-# Version 5.1: Game Detection Fix
-# Reverts the is_game_active function to a more reliable full-screen
-# check to ensure it always finds the game HUD before calibration.
+# Version 5.3: Detector Hot-Swap
+# Detectors load in the background through a process-wide registry
+# (one warmed-up instance per model path), and a replacement can be
+# swapped in between frames with automatic rollback.
 
 import mss
+import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
 from PIL import Image
 import numpy as np
 import cv2
 from ultralytics import YOLO
+from threat_scoring import THREAT_SCORER
+from hostile_markers import HostileMarkerDetector
+
+try:
+    import pytesseract  # Optional: only needed for text reading (Pip-Boy, banners)
+except ImportError:
+    pytesseract = None
+
+# Detectors that may be hot-swapped in; copy trained exports here (swap_model refuses anything else)
+MODELS_DIR = "models"
+
+class ModelRegistry:
+    """Process-wide detector cache: one loaded + warmed-up model per path"""
+
+    # Same shape as the HORIZON strip at base resolution
+    WARMUP_SHAPE = (480, 1920, 3)
+
+    def __init__(self):
+        self._models = {}
+        self._loaders = {}
+        self._lock = threading.Lock()
+        self.load_times = {}
+
+    def preload(self, model_path):
+        """Start loading a model in the background (no-op if loaded or loading)"""
+        with self._lock:
+            if model_path in self._models or model_path in self._loaders:
+                return
+            loader = threading.Thread(target=self._load, args=(model_path,), daemon=True)
+            self._loaders[model_path] = loader
+        loader.start()
+
+    def get(self, model_path):
+        """Return the shared model, loading it now (or waiting for the background load)"""
+        model = self._models.get(model_path)
+        if model is not None:
+            return model
+
+        self.preload(model_path)
+        with self._lock:
+            loader = self._loaders.get(model_path)
+        if loader:
+            loader.join()
+
+        if model_path not in self._models:
+            raise RuntimeError(f"Failed to load detector model '{model_path}'")
+        return self._models[model_path]
+
+    def is_ready(self, model_path):
+        return model_path in self._models
+
+    def is_loading(self, model_path):
+        with self._lock:
+            return model_path in self._loaders
+
+    def _load(self, model_path):
+        start = time.time()
+        try:
+            model = YOLO(model_path)
+            # Pay one-time init costs (weight fusing, kernel selection, allocator warm-up) now
+            model(np.zeros(self.WARMUP_SHAPE, dtype=np.uint8), verbose=False)
+            self._models[model_path] = model
+            self.load_times[model_path] = time.time() - start
+            print(f"👁️ Detector '{model_path}' loaded and warmed up in {self.load_times[model_path]:.1f}s")
+        except Exception as e:
+            print(f"Error loading detector '{model_path}': {e}")
+        finally:
+            with self._lock:
+                self._loaders.pop(model_path, None)
+
+MODEL_REGISTRY = ModelRegistry()
+
+class RoiTask:
+    """One ROI's capture contract: target rate, priority and timing bookkeeping"""
+
+    def __init__(self, name, rate_hz, priority=0):
+        self.name = name
+        self.rate_hz = rate_hz
+        self.priority = priority
+        self.next_due = 0.0
+        self.cost_ms = 2.0      # EMA of grab cost, used for budgeting
+        self.captures = 0
+        self.deferrals = 0
+
+class CaptureScheduler:
+    """Rate-monotonic ROI capture within a per-tick time budget"""
+
+    EDGE_MARGIN = 2         # px: a detection this close to an ROI edge "touches" it
+    GROWTH_STEP = 0.15      # grow the touched side by this fraction of the ROI size
+    MAX_GROWTH = 0.5        # never grow a side past this fraction of the base size
+    SHRINK_AFTER = 20       # captures without edge contact before reverting
+
+    def __init__(self, vision, budget_ms=12.0):
+        self.vision = vision
+        self.budget_ms = budget_ms
+        self.tasks = {}
+        self.latest = {}            # name -> (timestamp, PIL image)
+        self._growth = {}           # name -> {"left"/"top"/"right"/"bottom": px}
+        self._quiet = {}            # name -> captures since last edge contact
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._running = False
+        self._thread = None
+
+    def add(self, name, rate_hz, priority=0):
+        self.tasks[name] = RoiTask(name, rate_hz, priority)
+
+    def tick(self, now=None):
+        """Capture every due ROI that fits in the budget; returns the names captured"""
+        now = now if now is not None else time.perf_counter()
+        due = [task for task in self.tasks.values() if now >= task.next_due and task.name in self.vision.scaled_rois]
+        # Rate-monotonic: shortest period first, declared priority breaks ties
+        due.sort(key=lambda task: (-task.rate_hz, -task.priority))
+
+        sct = self._thread_sct()
+        spent_ms = 0.0
+        captured = []
+        for task in due:
+            if captured and spent_ms + task.cost_ms > self.budget_ms:
+                task.deferrals += 1
+                continue  # Still due; goes first among its rate class next tick
+
+            start = time.perf_counter()
+            image = self.vision.capture_roi_image(task.name, sct=sct)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            spent_ms += elapsed_ms
+
+            task.cost_ms = 0.8 * task.cost_ms + 0.2 * elapsed_ms
+            task.captures += 1
+            # Schedule from the nominal due time so the average rate holds under jitter,
+            # but resync instead of bursting if we fell more than a period behind
+            period = 1.0 / task.rate_hz
+            task.next_due = task.next_due + period if task.next_due + period > now else now + period
+            if image is not None:
+                with self._lock:
+                    self.latest[task.name] = (time.time(), image)
+                captured.append(task.name)
+        return captured
+
+    def get_latest(self, name, max_age=None):
+        """Most recent capture of an ROI (None if never captured or older than max_age)"""
+        with self._lock:
+            entry = self.latest.get(name)
+        if entry is None or (max_age is not None and time.time() - entry[0] > max_age):
+            return None
+        return entry[1]
+
+    @property
+    def running(self):
+        return self._running
+
+    def start(self):
+        """Run ticks on a background thread until stop()"""
+        if self._running:
+            return
+        if self._thread is not None:
+            self._thread.join()  # A stop(join=False) tick may still be finishing
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, join=True):
+        """Stop ticking; with join, returns only once the tick thread has exited"""
+        self._running = False
+        thread = self._thread
+        if join and thread is not None and thread is not threading.current_thread():
+            thread.join()
+            self._thread = None
+
+    @contextmanager
+    def paused(self):
+        """Hold capture off for the block (e.g. while another loop owns the screen), then restore it"""
+        was_running = self._running
+        self.stop()
+        try:
+            yield
+        finally:
+            if was_running:
+                self.start()
+
+    def _run(self):
+        while self._running:
+            self.tick()
+            if self.tasks:
+                next_due = min(task.next_due for task in self.tasks.values())
+                time.sleep(min(0.05, max(0.0, next_due - time.perf_counter())))
+            else:
+                time.sleep(0.05)
+
+    def _thread_sct(self):
+        # mss handles aren't safe to share across threads
+        if not hasattr(self._local, "sct"):
+            self._local.sct = mss.mss()
+        return self._local.sct
+
+    def grow_for_detections(self, name, detections, image_size):
+        """Widen an ROI on any side a detection touches; relax back once nothing does"""
+        base = self.vision.base_scaled_rois.get(name)
+        if not base:
+            return
+
+        width, height = image_size
+        growth = self._growth.setdefault(name, {"left": 0, "top": 0, "right": 0, "bottom": 0})
+        touched = False
+        for det in detections:
+            box = det.get("box")
+            if not box:
+                continue
+            x1, y1, x2, y2 = box
+            for side, hit in (("left", x1 <= self.EDGE_MARGIN), ("top", y1 <= self.EDGE_MARGIN),
+                              ("right", x2 >= width - self.EDGE_MARGIN), ("bottom", y2 >= height - self.EDGE_MARGIN)):
+                if hit:
+                    span = base["width"] if side in ("left", "right") else base["height"]
+                    growth[side] = min(growth[side] + int(span * self.GROWTH_STEP), int(span * self.MAX_GROWTH))
+                    touched = True
+
+        if touched:
+            self._quiet[name] = 0
+        else:
+            self._quiet[name] = self._quiet.get(name, 0) + 1
+            if self._quiet[name] >= self.SHRINK_AFTER:
+                growth.update(left=0, top=0, right=0, bottom=0)
+
+        self.vision.scaled_rois[name] = self._apply_growth(base, growth)
+
+    def _apply_growth(self, base, growth):
+        window = self.vision.game_window
+        left = max(window["left"], base["left"] - growth["left"])
+        top = max(window["top"], base["top"] - growth["top"])
+        right = min(window["left"] + window["width"], base["left"] + base["width"] + growth["right"])
+        bottom = min(window["top"] + window["height"], base["top"] + base["height"] + growth["bottom"])
+        return {"left": left, "top": top, "width": right - left, "height": bottom - top}
+
+    def get_stats(self):
+        return {
+            name: {"rate_hz": task.rate_hz, "captures": task.captures, "deferrals": task.deferrals, "cost_ms": round(task.cost_ms, 2)}
+            for name, task in self.tasks.items()
+        }
+
+class GameModeClassifier:
+    """Labels the current screen (loading, menu, map, pipboy, dead, gameplay) from a tiny sample"""
+
+    MODES = ("loading", "menu", "map", "pipboy", "dead", "gameplay", "unknown")
+    STRIDE = 24             # full-frame subsampling step (1080p -> 45x80 samples)
+
+    def __init__(self, hud_color_ranges):
+        # Players pick their HUD color, so any configured range counts as HUD
+        self.hud_ranges = [(np.array(lower), np.array(upper)) for lower, upper in hud_color_ranges.values()]
+        self.last_mode = "unknown"
+        self.last_features = {}
+        self.last_ms = 0.0
+
+    def hud_mask(self, hsv):
+        """Pixels in any configured HUD color"""
+        mask = cv2.inRange(hsv, *self.hud_ranges[0])
+        for lower, upper in self.hud_ranges[1:]:
+            mask |= cv2.inRange(hsv, lower, upper)
+        return mask
+
+    def classify(self, frame_bgrx, compass_rect):
+        """frame_bgrx: HxWx4 screen array from mss; compass_rect: (x, y, w, h) inside it"""
+        start = time.perf_counter()
+
+        sample = np.ascontiguousarray(frame_bgrx[::self.STRIDE, ::self.STRIDE, :3])
+        hsv = cv2.cvtColor(sample, cv2.COLOR_BGR2HSV)
+        h, sat, val = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+
+        dark = np.count_nonzero(val < 30) / val.size
+        red = np.count_nonzero(((h < 8) | (h > 170)) & (sat > 120) & (val > 60)) / val.size
+        hud = cv2.countNonZero(self.hud_mask(hsv)) / val.size
+        # The world map is a large, desaturated parchment-tan surface
+        parchment = np.count_nonzero((h >= 10) & (h <= 30) & (sat > 30) & (sat < 130) & (val > 110)) / val.size
+
+        # HUD-presence probe: the compass strip, read at full resolution
+        x, y, w, hgt = compass_rect
+        compass = np.ascontiguousarray(frame_bgrx[y:y + hgt:2, x:x + w:2, :3])
+        compass_hud = 0.0
+        if compass.size:
+            compass_hsv = cv2.cvtColor(compass, cv2.COLOR_BGR2HSV)
+            compass_hud = cv2.countNonZero(self.hud_mask(compass_hsv)) / (compass.shape[0] * compass.shape[1])
+
+        if dark > 0.85:
+            mode = "loading"
+        elif red > 0.25 and val.mean() < 90:
+            mode = "dead"
+        elif hud > 0.25:
+            mode = "pipboy"         # Pip-Boy fills the screen with the HUD color
+        elif parchment > 0.45:
+            mode = "map"
+        elif compass_hud > 0.02:
+            mode = "gameplay"
+        elif dark > 0.5:
+            mode = "menu"
+        else:
+            mode = "unknown"
+
+        self.last_mode = mode
+        self.last_features = {"dark": float(dark), "red": float(red), "hud": float(hud), "parchment": float(parchment), "compass_hud": float(compass_hud)}
+        self.last_ms = (time.perf_counter() - start) * 1000
+        return mode
+
+class SaliencyProposer:
+    """Finds small candidate regions (health bars, muzzle flashes, motion) to crop detector input"""
+
+    DOWNSCALE = 4
+    MIN_CROP = (256, 256)       # full-res crop size around a salient blob
+    MAX_PROPOSALS = 6
+    MAX_COVERAGE = 0.4          # above this fraction of the frame, just run the full frame
 
-class Vision:
     def __init__(self):
+        self.prev_gray = None
+        self.red_lower = [np.array([0, 150, 90]), np.array([170, 150, 90])]
+        self.red_upper = [np.array([8, 255, 255]), np.array([180, 255, 255])]
+
+    def propose(self, rgb):
+        """Return xyxy crop boxes in full-res coordinates, [] if nothing salient, None for 'use full frame'"""
+        height, width = rgb.shape[:2]
+        small = cv2.resize(rgb, (width // self.DOWNSCALE, height // self.DOWNSCALE), interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(small, cv2.COLOR_RGB2HSV)
+        gray = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+
+        # Enemy health bars are saturated red; muzzle flashes are near-white highlights
+        mask = cv2.inRange(hsv, self.red_lower[0], self.red_upper[0]) | cv2.inRange(hsv, self.red_lower[1], self.red_upper[1])
+        mask |= cv2.inRange(hsv, np.array([0, 0, 245]), np.array([40, 80, 255]))
+        if self.prev_gray is not None and self.prev_gray.shape == gray.shape:
+            _, motion = cv2.threshold(cv2.absdiff(gray, self.prev_gray), 25, 255, cv2.THRESH_BINARY)
+            mask |= motion
+        self.prev_gray = gray
+
+        mask = cv2.dilate(mask, np.ones((3, 3), np.uint8))
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+        blobs = [stats[i] for i in range(1, count) if stats[i][cv2.CC_STAT_AREA] >= 4]
+        if not blobs:
+            return []
+
+        boxes = []
+        for x, y, w, h, _ in blobs:
+            cx, cy = (x + w / 2) * self.DOWNSCALE, (y + h / 2) * self.DOWNSCALE
+            half_w = max(self.MIN_CROP[0], w * self.DOWNSCALE * 2) / 2
+            half_h = max(self.MIN_CROP[1], h * self.DOWNSCALE * 2) / 2
+            # Health bars float above the body, so extend the crop downwards
+            boxes.append([max(0, cx - half_w), max(0, cy - half_h * 0.5), min(width, cx + half_w), min(height, cy + half_h * 1.5)])
+
+        boxes = self._merge(boxes)
+        area = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in boxes)
+        if len(boxes) > self.MAX_PROPOSALS or area > self.MAX_COVERAGE * width * height:
+            return None
+        return [tuple(int(v) for v in box) for box in boxes]
+
+    @staticmethod
+    def _merge(boxes):
+        """Union overlapping crops until none overlap"""
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(boxes)):
+                for j in range(i + 1, len(boxes)):
+                    a, b = boxes[i], boxes[j]
+                    if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                        boxes[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                        del boxes[j]
+                        merged = True
+                        break
+                if merged:
+                    break
+        return boxes
+
+class Vision:
+    def __init__(self, model_path="yolov8n.pt", preload=True):
         self.sct = mss.mss()
-        self.model = YOLO("yolov8n.pt")
+        self.model_path = model_path
+        self.default_model_path = model_path    # always allowed as a swap target, to go back to it
+        if preload:
+            MODEL_REGISTRY.preload(model_path)
         self.game_window = None
         self.scaled_rois = {}
+        self.base_scaled_rois = {}
         self.base_resolution = (1920, 1080)
-        self.ui_map = { "HUD_ELEMENTS": { "COMPASS": (600, 50, 720, 50), "HORIZON": (0, 300, 1920, 480) } }
+        self.ui_map = {
+            "HUD_ELEMENTS": { "COMPASS": (600, 50, 720, 50), "HORIZON": (0, 300, 1920, 480), "HEALTH_BAR": (60, 1010, 330, 24), "LOCATION_BANNER": (40, 140, 760, 60) },
+            "MENU_ELEMENTS": { "PIPBOY_LIST": (150, 250, 720, 560) },
+            "ACTIVITY_ELEMENTS": { "BOBBER": (760, 420, 400, 320) },
+        }
         self.hud_color_ranges = { "green_amber": ([20, 100, 100], [40, 255, 255]), "white": ([0, 0, 180], [180, 30, 255]), "blue": ([100, 150, 150], [130, 255, 255]) }
+        self.mode_classifier = GameModeClassifier(self.hud_color_ranges)
+
+        # Enemy health bars / legendary stars: primary hostile signal, YOLO is secondary
+        self.hostile_detector = HostileMarkerDetector()
+
+        # Crop detector input to salient regions; full-strip inference every N frames
+        self.proposer = SaliencyProposer()
+        self.full_frame_interval = 10
+        self.frame_count = 0
+        self.last_analysis_full = False  # True when the last analyze_image saw the whole strip
+        self.detector_stats = {"frames": 0, "full_frames": 0, "cropped_frames": 0, "skipped_frames": 0, "pixels": 0, "full_frame_pixels": 0}
+
+        # Detector hot-swap: per-inference (latency ms, detections) for the live model
+        self.model_metrics = deque(maxlen=50)
+        self.model_swap = {"state": "idle", "candidate": None, "previous": None, "trial_frames": 0, "baseline": None, "result": None}
+
+        # Compass drives heading control, HORIZON feeds detection, HUD bars change slowly
+        self.scheduler = CaptureScheduler(self)
+        self.scheduler.add("COMPASS", rate_hz=30, priority=2)
+        self.scheduler.add("HORIZON", rate_hz=5, priority=1)
+        self.scheduler.add("HEALTH_BAR", rate_hz=1, priority=0)
+        self.scheduler.add("LOCATION_BANNER", rate_hz=0.5, priority=0)
         print("Vision module initialized, awaiting calibration.")
 
+    @property
+    def model(self):
+        """Shared detector for this Vision's model path (loaded on first use)"""
+        return MODEL_REGISTRY.get(self.model_path)
+
+    def swap_model(self, model_path, trial_frames=30, max_latency_ratio=1.2, min_detection_ratio=0.8):
+        """Load and warm a replacement detector in the background, then trial it live
+
+        The swap happens between frames once the candidate is warm. After
+        trial_frames inferences it is kept only if latency and detection rate
+        hold up against the previous model; otherwise we roll back.
+        """
+        if trial_frames < 1:
+            raise ValueError(f"trial_frames must be positive (got {trial_frames})")
+        model_path = self.resolve_model_path(model_path)
+        if model_path == self.model_path or self.model_swap["state"] in ("loading", "trial"):
+            return False
+        MODEL_REGISTRY.preload(model_path)
+        self.model_swap = {
+            "state": "loading", "candidate": model_path, "previous": self.model_path, "trial_frames": trial_frames,
+            "max_latency_ratio": max_latency_ratio, "min_detection_ratio": min_detection_ratio,
+            "baseline": self._metrics_summary(), "result": None
+        }
+        print(f"👁️ Loading replacement detector '{model_path}' in the background")
+        return True
+
+    def resolve_model_path(self, model_path):
+        """Local detector file under MODELS_DIR (or the startup model); raises ValueError otherwise
+
+        YOLO() downloads URLs and unpickles .pt files, so a swap target must
+        be something the operator put on disk, never a remote or arbitrary path.
+        """
+        if model_path == self.default_model_path:
+            return model_path
+        if "://" in model_path:
+            raise ValueError(f"remote model paths are not allowed: {model_path}")
+        root = os.path.realpath(MODELS_DIR)
+        path = os.path.realpath(os.path.join(root, model_path))
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f"model must be inside {MODELS_DIR}/: {model_path}")
+        if not os.path.exists(path):
+            raise ValueError(f"no such model in {MODELS_DIR}/: {model_path}")
+        return path
+
+    def get_model_status(self):
+        return {"model_path": self.model_path, "live": self._metrics_summary(), **self.model_swap}
+
+    def _metrics_summary(self):
+        if not self.model_metrics:
+            return None
+        latencies, counts = zip(*self.model_metrics)
+        return {"latency_ms": round(float(np.mean(latencies)), 2), "detections": round(float(np.mean(counts)), 2), "samples": len(latencies)}
+
+    def _advance_model_swap(self):
+        """Called at the top of each frame: activate, evaluate or roll back a pending swap"""
+        swap = self.model_swap
+        if swap["state"] == "loading":
+            if MODEL_REGISTRY.is_ready(swap["candidate"]):
+                self.model_path = swap["candidate"]
+                self.model_metrics.clear()
+                swap["state"] = "trial"
+                print(f"👁️ Detector '{swap['candidate']}' is live on trial")
+            elif not MODEL_REGISTRY.is_loading(swap["candidate"]):
+                swap.update(state="failed", result="load failed")
+        elif swap["state"] == "trial" and len(self.model_metrics) >= swap["trial_frames"]:
+            baseline, trial = swap["baseline"], self._metrics_summary()
+            if trial is None:
+                return  # No inference on the candidate yet; nothing to judge
+            swap["trial"] = trial
+            if baseline is None:
+                swap.update(state="committed", result="no baseline to compare against")
+            elif trial["latency_ms"] > baseline["latency_ms"] * swap["max_latency_ratio"]:
+                swap.update(state="rolled_back", result=f"latency {trial['latency_ms']}ms vs {baseline['latency_ms']}ms")
+            elif trial["detections"] < baseline["detections"] * swap["min_detection_ratio"]:
+                swap.update(state="rolled_back", result=f"detections {trial['detections']}/frame vs {baseline['detections']}")
+            else:
+                swap.update(state="committed", result="kept")
+
+            if swap["state"] == "rolled_back":
+                self.model_path = swap["previous"]
+                self.model_metrics.clear()
+            print(f"👁️ Detector swap to '{swap['candidate']}' {swap['state']}: {swap['result']}")
+
     def calibrate(self, monitor_number=1):
         monitor = self.sct.monitors[monitor_number]
         self.game_window = monitor
@@ -32,25 +517,90 @@ class Vision:
         current_w, current_h = self.game_window['width'], self.game_window['height']
         scale_x = current_w / base_w
         scale_y = current_h / base_h
-        for name, roi in self.ui_map["HUD_ELEMENTS"].items():
-            x, y, w, h = roi
-            scaled[name] = { "left": self.game_window['left'] + int(x * scale_x), "top": self.game_window['top'] + int(y * scale_y), "width": int(w * scale_x), "height": int(h * scale_y) }
+        for group in self.ui_map.values():
+            for name, roi in group.items():
+                x, y, w, h = roi
+                scaled[name] = { "left": self.game_window['left'] + int(x * scale_x), "top": self.game_window['top'] + int(y * scale_y), "width": int(w * scale_x), "height": int(h * scale_y) }
         self.scaled_rois = scaled
+        self.base_scaled_rois = dict(scaled)
 
-    def capture_roi_image(self, region_name):
+    def capture_roi_image(self, region_name, sct=None):
         if region_name not in self.scaled_rois: return None
         roi = self.scaled_rois[region_name]
-        sct_img = self.sct.grab(roi)
+        sct_img = (sct or self.sct).grab(roi)
         return Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
 
-    def analyze_image(self, img):
-        results = self.model(img, verbose=False)
+    def read_text(self, img):
+        """OCR a small UI crop (PIL image or grayscale array). Returns '' if OCR is unavailable."""
+        if pytesseract is None:
+            return ""
+        gray = np.array(img.convert("L")) if isinstance(img, Image.Image) else img
+        # HUD text is light on dark; tesseract prefers dark on light at ~2x size
+        gray = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        try:
+            return pytesseract.image_to_string(binary, config="--psm 7").strip()
+        except Exception as e:
+            print(f"OCR error: {e}")
+            return ""
+
+    def read_location_banner(self, banner):
+        """Location name from a LOCATION_BANNER capture, or None if no banner is showing"""
+        if banner is None or self.hud_fraction(banner) < 0.01:
+            return None
+        text = self.read_text(banner)
+        for prefix in ("LOCATION DISCOVERED", "DISCOVERED", "ENTERING"):
+            if text.upper().startswith(prefix):
+                text = text[len(prefix):]
+        name = text.strip(" :-").title()
+        return name if len(name) >= 3 else None
+
+    def hud_fraction(self, img):
+        """Fraction of an ROI drawn in the HUD color - a cheap 'is there UI text here' probe"""
+        hsv = cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2HSV)
+        return cv2.countNonZero(self.mode_classifier.hud_mask(hsv)) / (hsv.shape[0] * hsv.shape[1])
+
+    def analyze_image(self, img, use_proposals=True):
+        self._advance_model_swap()
+        model = self.model  # One model per frame, so a swap never splits a frame
+        THREAT_SCORER.bind_model(model.names)
+
+        self.frame_count += 1
+        full_frame_due = self.frame_count % self.full_frame_interval == 0
+        # Always run the proposer so its motion reference stays current
+        regions = self.proposer.propose(np.asarray(img)) if use_proposals else None
+        if full_frame_due:
+            regions = None
+
+        stats = self.detector_stats
+        stats["frames"] += 1
+        stats["full_frame_pixels"] += img.width * img.height
+        self.last_analysis_full = regions is None
+        if regions == []:
+            stats["skipped_frames"] += 1
+            return []
+
+        inference_start = time.perf_counter()
+        if regions is None:
+            results = model(img, verbose=False)
+            offsets = [(0, 0)]
+            stats["full_frames"] += 1
+            stats["pixels"] += img.width * img.height
+        else:
+            # One batched call over all crops
+            results = model([img.crop(region) for region in regions], verbose=False)
+            offsets = [(region[0], region[1]) for region in regions]
+            stats["cropped_frames"] += 1
+            stats["pixels"] += sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in regions)
+        inference_ms = (time.perf_counter() - inference_start) * 1000
+
         detections = []
         img_width = img.width
-        for result in results:
+        for result, (offset_x, offset_y) in zip(results, offsets):
             for box in result.boxes:
-                class_name = self.model.names[int(box.cls[0])]
-                bounding_box = box.xyxy[0].cpu().numpy()
+                class_id = int(box.cls[0])
+                class_name = model.names[class_id]
+                bounding_box = box.xyxy[0].cpu().numpy() + np.array([offset_x, offset_y, offset_x, offset_y])
                 x_center = (bounding_box[0] + bounding_box[2]) / 2
                 box_width = bounding_box[2] - bounding_box[0]
                 if x_center < img_width * 0.33: position = "on the left"
@@ -60,9 +610,38 @@ class Vision:
                 if relative_width > 0.4: size = "very large (close)"
                 elif relative_width > 0.2: size = "large (medium distance)"
                 else: size = "small (far away)"
-                detections.append({ "label": class_name, "position": position, "size": size })
+                detections.append({ "label": class_name, "class_id": class_id, "position": position, "size": size, "box": [int(v) for v in bounding_box], "confidence": float(box.conf[0]) })
+        self.model_metrics.append((inference_ms, len(detections)))
         return detections
 
+    def detect_hostiles(self, img):
+        """Hostile count, bearings and legendary status from the game's own enemy markers"""
+        return self.hostile_detector.detect(img)
+
+    def assess_threat(self, detections, img, hostiles=None):
+        """Scene threat summary (Rules 1.2.1/1.2.2) for detections from analyze_image"""
+        threat = THREAT_SCORER.score_detections(detections, img.size)
+        if hostiles is not None:
+            threat = THREAT_SCORER.merge_markers(threat, hostiles, self.hostile_detector.horizontal_fov)
+        return threat
+
+    def detect_game_mode(self):
+        """Classify the current screen; only 'gameplay' is worth running detection/decisions on"""
+        try:
+            monitor = self.game_window or self.sct.monitors[1]
+            sct_img = self.sct.grab(monitor)
+            frame = np.frombuffer(sct_img.bgra, dtype=np.uint8).reshape(sct_img.height, sct_img.width, 4)
+
+            scale_x = sct_img.width / self.base_resolution[0]
+            scale_y = sct_img.height / self.base_resolution[1]
+            x, y, w, h = self.ui_map["HUD_ELEMENTS"]["COMPASS"]
+            compass_rect = (int(x * scale_x), int(y * scale_y), int(w * scale_x), int(h * scale_y))
+
+            return self.mode_classifier.classify(frame, compass_rect)
+        except Exception as e:
+            print(f"Error during game mode detection: {e}")
+            return "unknown"
+
     def is_game_active(self):
         """
         FIX: This function now reliably checks the primary monitor to find the game.
@@ -6,8 +6,8 @@ import threading
 import time
 import json
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 import uvicorn
 from smart_goal_generator import SmartGoalGenerator
@@ -29,6 +29,13 @@ class SmartCustomGoal(BaseModel):
 class GoalsBatch(BaseModel):
     goals: Dict[str, bool]
 
+class RecordingToggle(BaseModel):
+    enabled: bool
+
+class ModelSwap(BaseModel):
+    model_path: str     # file under the models/ directory
+    trial_frames: int = Field(30, gt=0)
+
 class EnhancedWebServer:
     def __init__(self, shared_state, command_queue):
         self.shared_state = shared_state
@@ -39,6 +46,15 @@ class EnhancedWebServer:
         self.goal_manager = None
         self.smart_generator = None
 
+        # Annotated HORIZON preview (PreviewPublisher), optional
+        self.preview = None
+
+        # Vision instance for detector hot-swap, optional
+        self.vision = None
+
+        # SessionRecorder for detector training data, optional
+        self.session_recorder = None
+
         self.setup_routes()
 
     def set_goal_manager(self, goal_manager, knowledge_base=None):
@@ -47,6 +63,19 @@ class EnhancedWebServer:
         self.smart_generator = SmartGoalGenerator(knowledge_base)
         print("🌐 Enhanced goal manager with smart AI generation connected")
 
+    def set_preview(self, preview):
+        """Connect a PreviewPublisher for the /stream endpoint"""
+        self.preview = preview
+        print("🌐 Live preview stream available at /stream")
+
+    def set_vision(self, vision):
+        """Connect Vision so the detector can be hot-swapped via /vision/model"""
+        self.vision = vision
+
+    def set_session_recorder(self, recorder):
+        """Connect a SessionRecorder so recording can be toggled via /dataset/recording"""
+        self.session_recorder = recorder
+
     def setup_routes(self):
         @self.app.get("/")
         async def get_index():
@@ -79,6 +108,59 @@ class EnhancedWebServer:
 
             return status_data
 
+        @self.app.get("/stream")
+        async def get_stream():
+            """MJPEG stream of the latest HORIZON frame with detection boxes"""
+            if not self.preview:
+                raise HTTPException(status_code=404, detail="Preview stream not available")
+
+            return StreamingResponse(
+                self.preview.mjpeg_frames(),
+                media_type=f"multipart/x-mixed-replace; boundary={self.preview.BOUNDARY}",
+                headers={"Cache-Control": "no-cache, no-store, must-revalidate"}
+            )
+
+        @self.app.get("/vision/model")
+        async def get_vision_model():
+            """Current detector, its live metrics and any swap in progress"""
+            if not self.vision:
+                raise HTTPException(status_code=400, detail="Vision not available")
+            return self.vision.get_model_status()
+
+        @self.app.post("/vision/model")
+        async def swap_vision_model(swap: ModelSwap):
+            """Hot-swap the detector; it goes live on trial once warmed up"""
+            if not self.vision:
+                raise HTTPException(status_code=400, detail="Vision not available")
+            try:
+                started = self.vision.swap_model(swap.model_path, trial_frames=swap.trial_frames)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            if not started:
+                raise HTTPException(status_code=409, detail="Model already active or a swap is in progress")
+            return {
+                'status': 'loading',
+                'model_path': swap.model_path,
+                'message': f"Loading '{swap.model_path}' - it goes live once warmed up"
+            }
+
+        @self.app.get("/dataset/recording")
+        async def get_recording():
+            """Whether gameplay frames are being saved for detector training"""
+            if not self.session_recorder:
+                raise HTTPException(status_code=400, detail="Session recorder not available")
+            return {'enabled': self.session_recorder.enabled, 'root': self.session_recorder.root,
+                    **self.session_recorder.stats}
+
+        @self.app.post("/dataset/recording")
+        async def set_recording(toggle: RecordingToggle):
+            """Start or stop saving auto-labeled frames"""
+            if not self.session_recorder:
+                raise HTTPException(status_code=400, detail="Session recorder not available")
+            self.session_recorder.enabled = toggle.enabled
+            print(f"🎞️ Session recording {'enabled' if toggle.enabled else 'disabled'} ({self.session_recorder.root})")
+            return {'status': 'success', 'enabled': toggle.enabled, **self.session_recorder.stats}
+
         @self.app.post("/command")
         async def post_command(command: Command):
             if command.command in ["start", "stop", "pause", "resume"]: